@@ -20,10 +20,12 @@ class LIS:
     Attributes:
         ip: IP-адрес сервера ЛИС.
         port: Порт для подключения к серверу ЛИС.
+        cache_ttl: Время жизни результата ЛИС в кэше типов тестов (секунды).
     """
 
     ip: str
     port: int
+    cache_ttl: float = 3600.0
 
 
 @dataclass(frozen=True)
@@ -56,6 +58,9 @@ class RobotcConfig:
         robot_program_name: Имя программы на контроллере робота.
         scanner: Конфигурация сканера штрих-кодов.
         lis: Конфигурация подключения к ЛИС.
+        verbose_logging: Писать пошаговую трассировку сканирования
+            и сортировки (сырые ответы сканера, маппинг позиций)
+            на уровне INFO. По умолчанию она пишется на уровне DEBUG.
     """
 
     ip: str
@@ -63,6 +68,7 @@ class RobotcConfig:
     robot_program_name: str
     scanner: ScannerConfig
     lis: LIS
+    verbose_logging: bool = False
 
 
 def load_robot_config(path: Path | None = None) -> RobotcConfig:
@@ -100,7 +106,8 @@ def load_robot_config(path: Path | None = None) -> RobotcConfig:
 
     lis = LIS(
         ip=lis_raw["ip"],
-        port=int(lis_raw["port"])
+        port=int(lis_raw["port"]),
+        cache_ttl=float(lis_raw.get("cache_ttl", LIS.cache_ttl)),
     )
 
     return RobotcConfig(
@@ -109,4 +116,5 @@ def load_robot_config(path: Path | None = None) -> RobotcConfig:
         robot_program_name=robot_raw["robot_program_name"],
         scanner=scanner,
         lis=lis,
+        verbose_logging=bool(robot_raw.get("verbose_logging", False)),
     )
@@ -4,7 +4,7 @@
 и сканеров, используемых в автоматизированной ячейке.
 """
 
-from .base import Robot, DeviceError, ConnectionError, RobotIO, RobotRegisters, CellRobot, Scanner
+from .base import Robot, DeviceError, ConnectionError, RobotIO, RobotRegisters, CellRobot, Scanner, NO_READ
 from .robots import RobotAgilebot
 from .scanners import ScannerHikrobotTCP
 
@@ -16,6 +16,7 @@ __all__ = [
     "DeviceError",
     "ConnectionError",
     "Scanner",
+    "NO_READ",
     "RobotAgilebot",
     "ScannerHikrobotTCP",
 ]
@@ -8,6 +8,10 @@ RobotRegisters, Scanner) и составной класс CellRobot, а такж
 from abc import ABC, abstractmethod
 
 
+# Ответ сканера, если код не считан (в т.ч. для отдельной позиции группы)
+NO_READ = "NoRead"
+
+
 class DeviceError(Exception):
     """Базовое исключение для ошибок устройств.
 
@@ -91,6 +95,19 @@ class Robot(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_all_running_programms_states(self) -> str:
+        """Получить обобщённый статус выполняемых программ.
+
+        Returns:
+            Одна из строк: 'IDLE' (нет программ), 'RUNNING', 'PAUSED',
+            или 'MIXED' (несколько программ в разных состояниях).
+
+        Raises:
+            DeviceError: Если запрос состояния программ не удался.
+        """
+        ...
+
     @abstractmethod
     def reset_errors(self) -> None:
         """Сбросить все активные ошибки и тревоги робота.
@@ -100,6 +117,19 @@ class Robot(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_all_active_alarms(self) -> list:
+        """Получить имена всех активных тревог робота.
+
+        Returns:
+            Список уникальных имён активных тревог. Пустой список,
+            если тревог нет.
+
+        Raises:
+            DeviceError: Если запрос тревог не удался.
+        """
+        ...
+
 
 class RobotIO(ABC):
     """Абстрактный интерфейс цифровых входов/выходов робота.
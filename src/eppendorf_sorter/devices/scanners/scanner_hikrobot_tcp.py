@@ -11,7 +11,7 @@ import time
 from functools import wraps
 from typing import Callable, Tuple
 
-from src.eppendorf_sorter.devices import Scanner, ConnectionError, DeviceError
+from src.eppendorf_sorter.devices import Scanner, ConnectionError, DeviceError, NO_READ
 
 
 def require_connection(func: Callable):
@@ -61,8 +61,9 @@ class ScannerHikrobotTCP(Scanner):
         self._ip = ip
         self._port = port
         # Текстовые команды протокола Hikrobot для управления считыванием
-        self._enable_message = "start"
-        self._disable_message = "stop"
+        # (кодируются один раз, а не при каждой отправке)
+        self._enable_message = b"start"
+        self._disable_message = b"stop"
         self._socket: socket.socket | None = None
         self._connected: bool = False
 
@@ -87,6 +88,9 @@ class ScannerHikrobotTCP(Scanner):
         print(f"[{self.name}] Подключение к сканеру {self._ip}:{self._port}")
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Команды короткие и ждут ответа - отключаем алгоритм Нейгла,
+            # чтобы 'start'/'stop' уходили без задержки на склейку пакетов
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             sock.settimeout(2.0)
             sock.connect((self._ip, self._port))
         except socket.timeout as e:
@@ -154,7 +158,7 @@ class ScannerHikrobotTCP(Scanner):
         """
         assert self._socket is not None
         try:
-            self._socket.sendall(self._disable_message.encode("utf-8"))
+            self._socket.sendall(self._disable_message)
         except OSError as e:
             raise DeviceError(f"[{self.name}] Ошибка при отправке stop: {e}") from e
 
@@ -185,7 +189,7 @@ class ScannerHikrobotTCP(Scanner):
         # Отправляем 'start' -- сканер начинает считывание
         try:
             sock.settimeout(0.1)
-            sock.sendall(self._enable_message.encode("utf-8"))
+            sock.sendall(self._enable_message)
         except OSError as e:
             raise DeviceError(f"[{self.name}] Ошибка при старте сканирования: {e}") from e
 
@@ -202,10 +206,10 @@ class ScannerHikrobotTCP(Scanner):
 
                 result = data.decode("utf-8").replace("\r", "").strip()
 
-                if result and result != "NoRead":
+                if result and result != NO_READ:
                     # Отправляем 'stop' -- сканер прекращает считывание
                     try:
-                        sock.sendall(self._disable_message.encode("utf-8"))
+                        sock.sendall(self._disable_message)
                     except OSError:
                         pass
 
@@ -218,11 +222,11 @@ class ScannerHikrobotTCP(Scanner):
 
         # Таймаут истёк, код не считан -- останавливаем сканер
         try:
-            sock.sendall(self._disable_message.encode("utf-8"))
+            sock.sendall(self._disable_message)
         except OSError:
             pass
 
-        return "NoRead", 0.0
+        return NO_READ, 0.0
 
 if __name__ == '__main__':
     scanner = ScannerHikrobotTCP(name="Scanner", ip='192.168.124.4', port= 6000)
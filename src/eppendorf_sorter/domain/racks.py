@@ -7,8 +7,10 @@
 Интегрируется с main.py и обеспечивает thread-safe управление.
 """
 
+from collections import Counter
+from contextlib import contextmanager
 from enum import Enum
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Iterable, Iterator, Optional, Tuple, List
 import threading
 import logging
 
@@ -94,6 +96,18 @@ class TubeInfo:
             (None, если ещё не размещена).
     """
 
+    # Пробирок в цикле до сотни, и каждая проходит все потоки конвейера -
+    # без __dict__ экземпляр компактнее, а доступ к полям быстрее
+    __slots__ = (
+        "barcode",
+        "source_rack",
+        "number",
+        "test_type",
+        "raw_tests",
+        "destination_rack",
+        "destination_number",
+    )
+
     def __init__(self, barcode: str, source_rack: int, number: int,
                  test_type: TestType):
         """Инициализирует информацию о пробирке.
@@ -269,6 +283,23 @@ class BaseRack:
         """Освобождает штатив (устанавливает статус FREE)."""
         self.set_occupancy(RackOccupancy.FREE)
 
+    @contextmanager
+    def occupied(self) -> Iterator["BaseRack"]:
+        """Занимает штатив роботом на время блока ``with``.
+
+        Статус BUSY_ROBOT устанавливается один раз на входе и сбрасывается
+        в FREE на выходе (в том числе при исключении), вместо ручной пары
+        ``occupy()``/``release()`` вокруг каждой операции.
+
+        Yields:
+            Этот же штатив.
+        """
+        self.occupy()
+        try:
+            yield self
+        finally:
+            self.release()
+
     def mark_waiting_replace(self):
         """Помечает штатив как ожидающий замены оператором."""
         self.set_occupancy(RackOccupancy.WAITING_REPLACE)
@@ -456,21 +487,47 @@ class SourceRack(BaseRack):
             if tube.source_rack != self.rack_id:
                 raise ValueError(f"Пробирка принадлежит паллету {tube.source_rack}, а не {self.rack_id}")
 
-            if self._has_barcode_unsafe(tube.barcode):
-                logger.warning(f"Пробирка {tube.barcode} уже в паллете П{self.rack_id}")
-                return
-
-            self.tubes.append(tube)
-            logger.debug(f"Пробирка {tube.barcode} добавлена в П{self.rack_id} ({len(self.tubes)}/50)")
+            self._append_scanned_tube_unsafe(tube)
 
-    def add_scanned_tubes(self, tubes: List[TubeInfo]):
+    def add_scanned_tubes(self, tubes: List[TubeInfo]) -> int:
         """Добавляет несколько отсканированных пробирок в паллет.
 
+        Блокировка берётся один раз на весь пакет. Принадлежность
+        проверяется до изменения паллета, поэтому при ошибке пакет
+        не добавляется частично.
+
         Args:
             tubes: Список пробирок для добавления.
+
+        Returns:
+            Количество добавленных пробирок (без дубликатов).
+
+        Raises:
+            ValueError: Если хотя бы одна пробирка принадлежит другому паллету.
         """
-        for tube in tubes:
-            self.add_scanned_tube(tube)
+        with self._lock:
+            for tube in tubes:
+                if tube.source_rack != self.rack_id:
+                    raise ValueError(f"Пробирка принадлежит паллету {tube.source_rack}, а не {self.rack_id}")
+
+            return sum(self._append_scanned_tube_unsafe(tube) for tube in tubes)
+
+    def _append_scanned_tube_unsafe(self, tube: TubeInfo) -> bool:
+        """Добавляет пробирку без блокировки, пропуская дубликаты.
+
+        Args:
+            tube: Информация о пробирке для добавления.
+
+        Returns:
+            True, если пробирка добавлена; False, если это дубликат.
+        """
+        if self._has_barcode_unsafe(tube.barcode):
+            logger.warning(f"Пробирка {tube.barcode} уже в паллете П{self.rack_id}")
+            return False
+
+        self.tubes.append(tube)
+        logger.debug("Пробирка %s добавлена в П%d (%d/50)", tube.barcode, self.rack_id, len(self.tubes))
+        return True
 
     def mark_tube_sorted(self, barcode: str) -> bool:
         """Отмечает пробирку как отсортированную.
@@ -493,7 +550,10 @@ class SourceRack(BaseRack):
                 return False
 
             self._sorted_count += 1
-            logger.debug(f"Пробирка {barcode} отсортирована из П{self.rack_id} ({self._sorted_count}/{len(self.tubes)})")
+            logger.debug(
+                "Пробирка %s отсортирована из П%d (%d/%d)",
+                barcode, self.rack_id, self._sorted_count, len(self.tubes),
+            )
             return True
 
     # ---------------------- СТАТУСЫ И ПРОВЕРКИ ----------------------
@@ -607,10 +667,7 @@ class SourceRack(BaseRack):
             Словарь {тип_теста: количество_пробирок}.
         """
         with self._lock:
-            stats = {}
-            for tube in self.tubes:
-                stats[tube.test_type] = stats.get(tube.test_type, 0) + 1
-            return stats
+            return Counter(tube.test_type for tube in self.tubes)
 
     # ---------------------- УПРАВЛЕНИЕ ----------------------
 
@@ -634,7 +691,7 @@ class SourceRack(BaseRack):
         with self._lock:
             self.tubes = [t for t in self.tubes if t.destination_rack is None]
             self._sorted_count = 0
-            logger.debug(f"Очищены отсортированные пробирки из П{self.rack_id}")
+            logger.debug("Очищены отсортированные пробирки из П%d", self.rack_id)
 
 
 
@@ -696,7 +753,10 @@ class DestinationRack(BaseRack):
             self.tubes.append(tube)
             self._next_number += 1
 
-            logger.debug(f"Пробирка {tube.barcode} добавлена в штатив #{self.rack_id} на место #{tube.destination_number}")
+            logger.debug(
+                "Пробирка %s добавлена в штатив #%d на место #%d",
+                tube.barcode, self.rack_id, tube.destination_number,
+            )
             return tube
 
     # ---------------------- СТАТУСЫ И ПРОВЕРКИ ----------------------
@@ -727,6 +787,19 @@ class DestinationRack(BaseRack):
         with self._lock:
             return len(self.tubes) >= self.target
 
+    def is_below_target(self) -> bool:
+        """Проверяет, можно ли класть пробирки в штатив при сортировке.
+
+        Объединяет проверки ``is_full()`` и ``reached_target()`` под одной
+        блокировкой.
+
+        Returns:
+            True, если штатив не заполнен и не достиг целевого значения.
+        """
+        with self._lock:
+            count = len(self.tubes)
+            return count < self.MAX_TUBES and count < self.target
+
     def can_add_tubes(self) -> bool:
         """Проверяет, можно ли добавлять пробирки в штатив.
 
@@ -808,6 +881,9 @@ class RackSystemManager:
         """Инициализирует менеджер системы штативов с пустыми коллекциями."""
         self.source_pallets: Dict[int, SourceRack] = {}
         self.destination_racks: Dict[int, DestinationRack] = {}
+        # Индекс целевых штативов по типу теста, упорядоченный по rack_id:
+        # поиск штатива для пробирки проходит только по штативам её типа
+        self._racks_by_type: Dict[TestType, List[DestinationRack]] = {}
         self._lock = threading.RLock()
 
         logger.info("RackSystemManager инициализирован")
@@ -839,9 +915,15 @@ class RackSystemManager:
             rack: Целевой штатив для добавления.
         """
         with self._lock:
-            if rack.rack_id in self.destination_racks:
+            previous = self.destination_racks.get(rack.rack_id)
+            if previous is not None:
                 logger.warning(f"Штатив #{rack.rack_id} уже существует, перезапись")
+                self._racks_by_type[previous.test_type].remove(previous)
             self.destination_racks[rack.rack_id] = rack
+
+            type_racks = self._racks_by_type.setdefault(rack.test_type, [])
+            type_racks.append(rack)
+            type_racks.sort(key=lambda r: r.rack_id)
             logger.info(f"Добавлен целевой штатив #{rack.rack_id} ({rack.test_type.value})")
 
     def initialize_source_pallets(self, pallets_list: List[SourceRack]):
@@ -926,7 +1008,7 @@ class RackSystemManager:
             Список штативов с совпадающим типом теста.
         """
         with self._lock:
-            return [r for r in self.destination_racks.values() if r.test_type == test_type]
+            return list(self._racks_by_type.get(test_type, ()))
 
     def get_all_destination_racks(self) -> List[DestinationRack]:
         """Возвращает список всех целевых штативов.
@@ -972,11 +1054,17 @@ class RackSystemManager:
         Returns:
             Количество успешно добавленных пробирок.
         """
-        count = 0
-        for tube in tubes:
-            if self.add_scanned_tube(pallet_id, tube):
-                count += 1
-        return count
+        with self._lock:
+            pallet = self.get_source_pallet(pallet_id)
+            if not pallet:
+                logger.error(f"Паллет П{pallet_id} не найден")
+                return 0
+
+            try:
+                return pallet.add_scanned_tubes(tubes)
+            except ValueError as e:
+                logger.error(f"Ошибка добавления: {e}")
+                return 0
 
     def mark_tube_sorted(self, pallet_id: int, barcode: str) -> bool:
         """Отмечает пробирку в паллете как отсортированную.
@@ -1013,7 +1101,7 @@ class RackSystemManager:
 
             try:
                 rack.add_tube(tube)
-                logger.debug(f"Пробирка {tube.barcode} добавлена в штатив #{rack_id}")
+                logger.debug("Пробирка %s добавлена в штатив #%d", tube.barcode, rack_id)
                 return True
             except ValueError as e:
                 logger.error(f"Ошибка добавления: {e}")
@@ -1094,16 +1182,11 @@ class RackSystemManager:
             или достигли целевого значения.
         """
         with self._lock:
-            candidates = [r for r in self.destination_racks.values()
-                         if r.test_type == test_type and not r.is_full()]
-
-            if not candidates:
-                return None
-
-            for rack in sorted(candidates, key=lambda r: r.rack_id):
-                if not rack.reached_target():
+            # Штативы типа уже упорядочены по ID - первый подходящий и есть
+            # штатив с наименьшим ID
+            for rack in self._racks_by_type.get(test_type, ()):
+                if rack.is_below_target():
                     return rack
-
             return None
 
     def has_available_rack(self, test_type: TestType) -> bool:
@@ -1117,6 +1200,26 @@ class RackSystemManager:
         """
         return self.find_available_rack(test_type) is not None
 
+    def find_unavailable_type(self, test_types: Iterable[TestType]) -> Optional[TestType]:
+        """Находит первый тип теста, для которого нет доступного штатива.
+
+        Проверяет все типы под одной блокировкой менеджера вместо
+        отдельного вызова ``has_available_rack`` на каждый тип.
+
+        Args:
+            test_types: Типы тестов для проверки.
+
+        Returns:
+            Первый тип без доступного штатива или None, если штативы
+            есть для всех типов.
+        """
+        with self._lock:
+            racks_by_type = self._racks_by_type
+            for test_type in test_types:
+                if not any(rack.is_below_target() for rack in racks_by_type.get(test_type, ())):
+                    return test_type
+            return None
+
     def get_available_racks(self, test_type: TestType) -> List[DestinationRack]:
         """Возвращает все доступные штативы для указанного типа теста.
 
@@ -1127,8 +1230,7 @@ class RackSystemManager:
             Список штативов, в которые можно добавлять пробирки.
         """
         with self._lock:
-            return [r for r in self.destination_racks.values()
-                    if r.test_type == test_type and r.can_add_tubes()]
+            return [r for r in self._racks_by_type.get(test_type, ()) if r.can_add_tubes()]
 
     # ==================== ПРОВЕРКИ СТАТУСОВ ====================
 
@@ -1280,17 +1382,28 @@ class RackSystemManager:
             else:
                 logger.error(f"Штатив #{rack_id} не найден")
 
-    def reset_rack_pair(self, test_type: TestType):
+    def reset_rack_pair(self, test_type: TestType) -> Optional[DestinationRack]:
         """Сбрасывает все штативы указанного типа теста.
 
+        Доступный штатив выбирается под той же блокировкой, что и сброс,
+        поэтому вызывающему коду не нужен отдельный ``find_available_rack``.
+
         Args:
             test_type: Тип теста, штативы которого нужно сбросить.
+
+        Returns:
+            Доступный штатив с наименьшим ID после сброса или None,
+            если штативов этого типа нет (или у всех нулевое целевое значение).
         """
         with self._lock:
-            type_racks = self.get_racks_by_type(test_type)
+            type_racks = self._racks_by_type.get(test_type, ())
             for rack in type_racks:
                 rack.reset()
             logger.info(f"Сброшена пара штативов {test_type.value}")
+            for rack in type_racks:
+                if rack.is_below_target():
+                    return rack
+            return None
 
     def reset_all_source_pallets(self):
         """Сбрасывает все исходные паллеты в начальное состояние."""
@@ -74,6 +74,16 @@ class AppStatus(Enum):
     WAITING = "ОЖИДАНИЕ"
 
 
+# Доступность кнопок по статусу:
+# (СТАРТ, ПАУЗА, ПРОДОЛЖИТЬ, СТОП, ШТАТИВ ЗАМЕНЁН, СБРОС КЭША ЛИС)
+BUTTON_STATES = {
+    AppStatus.STOPPED: (tk.NORMAL, tk.DISABLED, tk.DISABLED, tk.DISABLED, tk.DISABLED, tk.DISABLED),
+    AppStatus.RUNNING: (tk.DISABLED, tk.NORMAL, tk.DISABLED, tk.NORMAL, tk.DISABLED, tk.NORMAL),
+    AppStatus.PAUSED: (tk.DISABLED, tk.DISABLED, tk.NORMAL, tk.NORMAL, tk.DISABLED, tk.NORMAL),
+    AppStatus.WAITING: (tk.DISABLED, tk.DISABLED, tk.DISABLED, tk.NORMAL, tk.NORMAL, tk.NORMAL),
+}
+
+
 # ==================== ДИАЛОГ ЗАМЕНЫ ШТАТИВА ====================
 
 class RackReplacementDialog(tk.Toplevel):
@@ -371,6 +381,7 @@ class SorterGUI:
         - set_pause_callback() — пауза робота.
         - set_resume_callback() — продолжение работы робота.
         - set_rack_replaced_callback() — подтверждение замены штатива.
+        - set_clear_lis_cache_callback() — сброс кэша результатов ЛИС.
 
     Attributes:
         root: Корневое окно Tkinter.
@@ -401,6 +412,7 @@ class SorterGUI:
         self._pause_callback: Optional[Callable] = None
         self._resume_callback: Optional[Callable] = None
         self._rack_replaced_callback: Optional[Callable] = None
+        self._clear_lis_cache_callback: Optional[Callable] = None
 
         # --- Виджеты для обновления ---
         self._pallet_trees: Dict[int, ttk.Treeview] = {}
@@ -410,6 +422,10 @@ class SorterGUI:
         self._rack_matrices: Dict[int, Dict] = {}  # Матрицы ячеек для штативов
         self._rack_matrix_frames: Dict[int, tk.Frame] = {}  # Фреймы матриц для перестроения
 
+        # --- Последние отрисованные снимки (перерисовка только при изменениях) ---
+        self._pallet_view_cache: Dict[int, tuple] = {}
+        self._rack_view_cache: Dict[int, tuple] = {}
+
         # --- Создание интерфейса ---
         self._setup_styles()
         self._create_widgets()
@@ -554,7 +570,8 @@ class SorterGUI:
     def _create_control_buttons(self, parent: tk.Frame):
         """Создание панели кнопок управления.
 
-        Включает кнопки: СТАРТ, ПАУЗА, ПРОДОЛЖИТЬ, СТОП и ШТАТИВ ЗАМЕНЁН.
+        Включает кнопки: СТАРТ, ПАУЗА, ПРОДОЛЖИТЬ, СТОП, ШТАТИВ ЗАМЕНЁН
+        и СБРОС КЭША ЛИС.
         Доступность кнопок управляется через ``_update_buttons_state``.
 
         Args:
@@ -612,6 +629,16 @@ class SorterGUI:
         )
         self._rack_replaced_btn.pack(side=tk.RIGHT, padx=5)
 
+        # Кнопка СБРОС КЭША ЛИС (если тесты пробирок в ЛИС изменились)
+        self._clear_lis_cache_btn = ttk.Button(
+            buttons_frame,
+            text="СБРОС КЭША ЛИС",
+            style="Pause.TButton",
+            command=self._on_clear_lis_cache_click,
+            state=tk.DISABLED,
+        )
+        self._clear_lis_cache_btn.pack(side=tk.RIGHT, padx=5)
+
     def _create_main_area(self, parent: tk.Frame):
         """Создание основной области: исходные штативы слева, целевые справа.
 
@@ -819,6 +846,9 @@ class SorterGUI:
         for widget in matrix_frame.winfo_children():
             widget.destroy()
 
+        # Новые ячейки пусты - при следующем обновлении штатив перерисуется целиком
+        self._rack_view_cache.pop(rack_id, None)
+
         if total_cells <= 0:
             self._rack_matrices[rack_id] = {}
             return
@@ -1073,6 +1103,28 @@ class SorterGUI:
             except Exception as e:
                 messagebox.showerror("Ошибка", f"Ошибка: {e}")
 
+    def _on_clear_lis_cache_click(self):
+        """Обработчик кнопки СБРОС КЭША ЛИС.
+
+        После подтверждения вызывает callback сброса кэша: следующие
+        пробирки будут заново запрошены в ЛИС, а не взяты из кэша.
+
+        Raises:
+            Отображает messagebox при ошибке в callback.
+        """
+        if not self._clear_lis_cache_callback:
+            return
+        if not messagebox.askyesno(
+            "Сброс кэша ЛИС",
+            "Очистить сохранённые результаты ЛИС?\n"
+            "Все пробирки будут заново запрошены в ЛИС.",
+        ):
+            return
+        try:
+            self._clear_lis_cache_callback()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сбросить кэш ЛИС: {e}")
+
     def _get_rack_ids_from_reason(self, reason: str) -> list:
         """Извлечь идентификаторы штативов из текста причины ожидания.
 
@@ -1164,36 +1216,27 @@ class SorterGUI:
 
     def _update_buttons_state(self):
         """Обновить доступность кнопок в зависимости от текущего статуса."""
-        if self._status == AppStatus.STOPPED:
-            self._start_btn.configure(state=tk.NORMAL)
-            self._pause_btn.configure(state=tk.DISABLED)
-            self._resume_btn.configure(state=tk.DISABLED)
-            self._stop_btn.configure(state=tk.DISABLED)
-            self._rack_replaced_btn.configure(state=tk.DISABLED)
-
-        elif self._status == AppStatus.RUNNING:
-            self._start_btn.configure(state=tk.DISABLED)
-            self._pause_btn.configure(state=tk.NORMAL)
-            self._resume_btn.configure(state=tk.DISABLED)
-            self._stop_btn.configure(state=tk.NORMAL)
-            self._rack_replaced_btn.configure(state=tk.DISABLED)
-
-        elif self._status == AppStatus.PAUSED:
-            self._start_btn.configure(state=tk.DISABLED)
-            self._pause_btn.configure(state=tk.DISABLED)
-            self._resume_btn.configure(state=tk.NORMAL)
-            self._stop_btn.configure(state=tk.NORMAL)
-            self._rack_replaced_btn.configure(state=tk.DISABLED)
-
-        elif self._status == AppStatus.WAITING:
-            self._start_btn.configure(state=tk.DISABLED)
-            self._pause_btn.configure(state=tk.DISABLED)
-            self._resume_btn.configure(state=tk.DISABLED)
-            self._stop_btn.configure(state=tk.NORMAL)
-            self._rack_replaced_btn.configure(state=tk.NORMAL)
+        states = BUTTON_STATES.get(self._status)
+        if states is None:
+            return
+
+        buttons = (
+            self._start_btn,
+            self._pause_btn,
+            self._resume_btn,
+            self._stop_btn,
+            self._rack_replaced_btn,
+            self._clear_lis_cache_btn,
+        )
+        for button, state in zip(buttons, states):
+            button.configure(state=state)
 
     def _update_pallets_view(self):
-        """Обновить отображение таблиц исходных штативов из модели данных."""
+        """Обновить отображение таблиц исходных штативов из модели данных.
+
+        Строки таблицы собираются в снимок и сравниваются с предыдущим:
+        таблица перестраивается только если содержимое паллета изменилось.
+        """
         if not self._rack_manager:
             return
 
@@ -1202,27 +1245,34 @@ class SorterGUI:
             if not pallet:
                 continue
 
+            # Снимок строк таблицы
+            rows = tuple(
+                (
+                    tube.number,
+                    tube.barcode,
+                    ", ".join(tube.raw_tests) if tube.raw_tests else tube.test_type.name,
+                    "Отсортирована" if tube.is_placed else "Ожидает",
+                )
+                for tube in pallet.get_tubes()
+            )
+            if self._pallet_view_cache.get(pallet_id) == rows:
+                continue
+            self._pallet_view_cache[pallet_id] = rows
+
             # Очищаем таблицу
             for item in tree.get_children():
                 tree.delete(item)
 
             # Добавляем пробирки
-            tubes = pallet.get_tubes()
-            for tube in tubes:
-                status = "Отсортирована" if tube.is_placed else "Ожидает"
-                tests_display = ", ".join(tube.raw_tests) if tube.raw_tests else tube.test_type.name
-                tree.insert("", tk.END, values=(
-                    tube.number,
-                    tube.barcode,
-                    tests_display,
-                    status,
-                ))
+            for values in rows:
+                tree.insert("", tk.END, values=values)
 
     def _update_racks_view(self):
         """Обновить отображение целевых штативов из модели данных.
 
         Обновляет счётчики заполнения, прогресс-бары, заголовки вкладок
-        и содержимое матриц ячеек для каждого целевого штатива.
+        и содержимое матриц ячеек для каждого целевого штатива. Виджеты
+        штатива перенастраиваются только если его снимок изменился.
         """
         if not self._rack_manager:
             return
@@ -1232,14 +1282,9 @@ class SorterGUI:
             if not rack:
                 continue
 
-            count = rack.get_tube_count()
+            tubes = rack.get_tubes()
+            count = len(tubes)
             target = rack.target
-            label.configure(text=f"{count}/{target}")
-
-            # Обновляем прогресс-бар
-            if hasattr(label, '_progress'):
-                label._progress['maximum'] = target if target > 0 else 1
-                label._progress['value'] = count
 
             # Обновляем поле target (только если не в фокусе)
             target_entry = self._rack_target_entries.get(rack_id)
@@ -1247,6 +1292,32 @@ class SorterGUI:
             if target_entry and target_var and self.root.focus_get() != target_entry:
                 target_var.set(str(target))
 
+            # Снимок штатива: без изменений - виджеты не трогаем
+            tubes_by_pos = {}
+            for tube in tubes:
+                if tube.destination_number is not None:
+                    # +1: destination_number в модели 0-based, а GUI-позиции 1-based
+                    tubes_by_pos[tube.destination_number + 1] = tube
+            snapshot = (
+                count,
+                target,
+                rack.test_type,
+                tuple(
+                    (pos, tube.barcode, tube.test_type, tuple(tube.raw_tests or ()))
+                    for pos, tube in sorted(tubes_by_pos.items())
+                ),
+            )
+            if self._rack_view_cache.get(rack_id) == snapshot:
+                continue
+            self._rack_view_cache[rack_id] = snapshot
+
+            label.configure(text=f"{count}/{target}")
+
+            # Обновляем прогресс-бар
+            if hasattr(label, '_progress'):
+                label._progress['maximum'] = target if target > 0 else 1
+                label._progress['value'] = count
+
             # Обновляем заголовок вкладки
             if hasattr(self, '_racks_notebook'):
                 for i in range(self._racks_notebook.index("end")):
@@ -1257,13 +1328,6 @@ class SorterGUI:
             # --- Обновление матрицы ячеек ---
             cell_labels = self._rack_matrices.get(rack_id)
             if cell_labels:
-                tubes = rack.get_tubes()
-                tubes_by_pos = {}
-                for tube in tubes:
-                    if tube.destination_number is not None:
-                        # +1: destination_number в модели 0-based, а GUI-позиции 1-based
-                        tubes_by_pos[tube.destination_number + 1] = tube
-
                 # Обновляем каждую ячейку
                 for pos, cell in cell_labels.items():
                     tube = tubes_by_pos.get(pos)
@@ -1377,6 +1441,15 @@ class SorterGUI:
         """
         self._rack_replaced_callback = callback
 
+    def set_clear_lis_cache_callback(self, callback: Callable):
+        """Установить callback для кнопки сброса кэша ЛИС.
+
+        Args:
+            callback: Функция, вызываемая после подтверждения сброса
+                кэша результатов ЛИС.
+        """
+        self._clear_lis_cache_callback = callback
+
     def set_waiting_mode(self, reason: str):
         """Перевести приложение в режим ожидания замены штатива.
 
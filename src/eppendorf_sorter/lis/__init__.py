@@ -4,10 +4,11 @@
 и парсинг типов тестов из ответов ЛИС.
 """
 
-from .client import get_tube_info_sync, parse_test_type, LISClient
+from .client import get_tube_info_sync, parse_test_type, LISClient, TubeTypeCache
 
 __all__ = [
     "get_tube_info_sync",
     "parse_test_type",
     "LISClient",
+    "TubeTypeCache",
 ]
@@ -14,9 +14,11 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import Optional, Dict, List, Tuple
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 import threading
+import time
 
 try:
     from ..domain.racks import TestType
@@ -33,13 +35,35 @@ logger = logging.getLogger("Sorter.LIS")
 # чтобы избежать гонок при одновременных HTTP-запросах из разных потоков.
 _thread_local = threading.local()
 
+# Группа теста по его названию: "pcr1" -> UGI, "pcr2" -> VPCH, "pcr" -> OTHER.
+# Ключи - нормализованные (strip + casefold) названия; дополнительно заведены
+# написания в верхнем регистре, чтобы типичный ответ ЛИС ("PCR-1") находился
+# прямым поиском без нормализации строки
+_TEST_GROUPS: Dict[str, str] = {
+    "pcr-1": "pcr1", "pcr1": "pcr1", "ugi": "pcr1",
+    "pcr-2": "pcr2", "pcr2": "pcr2", "vpch": "pcr2",
+    "pcr": "pcr",
+}
+_TEST_GROUPS.update({name.upper(): group for name, group in list(_TEST_GROUPS.items())})
+
+
+# Время жизни записи в кэше типов тестов по умолчанию (секунды).
+# Рабочее значение задаётся в конфиге (lis.cache_ttl)
+TUBE_TYPE_CACHE_TTL = 3600.0
+
+# Максимальное число записей в кэше типов тестов. При переполнении
+# вытесняются давно не запрошенные баркоды (LRU)
+TUBE_TYPE_CACHE_MAX_SIZE = 10000
+
 
 def _get_session() -> requests.Session:
     """Возвращает requests.Session для текущего потока.
 
     Сессия создаётся лениво при первом вызове в потоке и переиспользуется
-    при последующих вызовах. Настроена с retry-политикой и отключённым
-    keep-alive (Connection: close).
+    при последующих вызовах. Настроена с retry-политикой; соединение
+    с ЛИС остаётся открытым (keep-alive) и переиспользуется следующими
+    запросами потока без повторного TCP-рукопожатия. Если сервер закрыл
+    соединение, запрос повторяется по retry-политике.
 
     Returns:
         Экземпляр requests.Session, привязанный к текущему потоку.
@@ -58,7 +82,6 @@ def _get_session() -> requests.Session:
         )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
-        session.headers["Connection"] = "close"
         _thread_local.session = session
     return _thread_local.session
 
@@ -140,13 +163,20 @@ def parse_test_type(response: Optional[Dict]) -> Tuple[TestType, List[str]]:
     # Сохраняем сырые тесты как список строк
     raw_tests = list(tests) if isinstance(tests, list) else [str(tests)]
 
-    # Нормализуем названия тестов (приводим к нижнему регистру)
-    tests_lower = [t.lower().strip() for t in raw_tests]
+    # Один проход по тестам: прямой поиск в таблице, нормализация регистра
+    # и пробелов - только для нестандартных написаний
+    groups = set()
+    for test in raw_tests:
+        group = _TEST_GROUPS.get(test)
+        if group is None:
+            group = _TEST_GROUPS.get(test.strip().casefold())
+        if group is not None:
+            groups.add(group)
 
     # Проверяем наличие конкретных тестов
-    has_pcr1 = any(t in ["pcr-1", "pcr1", "ugi"] for t in tests_lower)
-    has_pcr2 = any(t in ["pcr-2", "pcr2", "vpch"] for t in tests_lower)
-    has_pcr_generic = any(t == "pcr" for t in tests_lower)
+    has_pcr1 = "pcr1" in groups
+    has_pcr2 = "pcr2" in groups
+    has_pcr_generic = "pcr" in groups
 
     if has_pcr1 and has_pcr2:
         result = TestType.UGI_VPCH
@@ -164,6 +194,75 @@ def parse_test_type(response: Optional[Dict]) -> Tuple[TestType, List[str]]:
     return result, raw_tests
 
 
+class TubeTypeCache:
+    """Потокобезопасный кэш результатов ЛИС по баркоду с ограниченным временем жизни.
+
+    Хранит тип теста и сырые тесты, полученные от ЛИС. Результаты
+    ERROR и UNKNOWN не кэшируются: ошибка запроса временная, а тесты
+    для пробирки могут быть назначены позже. Размер кэша ограничен:
+    при переполнении удаляется запись, к которой дольше всего не обращались.
+
+    Attributes:
+        ttl: Время жизни записи в секундах.
+        max_size: Максимальное число записей.
+    """
+
+    def __init__(self, ttl: float = TUBE_TYPE_CACHE_TTL, max_size: int = TUBE_TYPE_CACHE_MAX_SIZE):
+        """Инициализирует пустой кэш.
+
+        Args:
+            ttl: Время жизни записи в секундах.
+            max_size: Максимальное число записей.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, TestType, Tuple[str, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, barcode: str) -> Optional[Tuple[TestType, List[str]]]:
+        """Возвращает закэшированный результат для баркода.
+
+        Args:
+            barcode: Баркод пробирки.
+
+        Returns:
+            Кортеж (TestType, список сырых тестов) или None, если записи
+            нет или её время жизни истекло.
+        """
+        with self._lock:
+            entry = self._entries.get(barcode)
+            if entry is None:
+                return None
+            expires_at, test_type, raw_tests = entry
+            if expires_at <= time.monotonic():
+                del self._entries[barcode]
+                return None
+            self._entries.move_to_end(barcode)
+        return test_type, list(raw_tests)
+
+    def put(self, barcode: str, test_type: TestType, raw_tests: List[str]) -> None:
+        """Сохраняет результат ЛИС для баркода.
+
+        Args:
+            barcode: Баркод пробирки.
+            test_type: Определённый тип теста.
+            raw_tests: Сырые названия тестов из ответа ЛИС.
+        """
+        if test_type in (TestType.ERROR, TestType.UNKNOWN):
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[barcode] = (expires_at, test_type, tuple(raw_tests))
+            self._entries.move_to_end(barcode)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Удаляет все записи кэша."""
+        with self._lock:
+            self._entries.clear()
+
+
 class LISClient:
     """Многопоточный клиент для пакетных запросов к ЛИС.
 
@@ -175,9 +274,17 @@ class LISClient:
         port: Порт ЛИС сервера.
         timeout: Таймаут одного HTTP-запроса в секундах.
         executor: Пул потоков для параллельных запросов.
+        type_cache: Кэш результатов ЛИС по баркоду.
     """
 
-    def __init__(self, host: str, port: int, max_workers: int = 20, timeout: float = 10.0):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        max_workers: int = 20,
+        timeout: float = 10.0,
+        cache_ttl: float = TUBE_TYPE_CACHE_TTL,
+    ):
         """Инициализирует клиент и создаёт пул потоков.
 
         Args:
@@ -185,11 +292,13 @@ class LISClient:
             port: Порт ЛИС сервера.
             max_workers: Количество потоков для параллельных запросов.
             timeout: Таймаут одного запроса в секундах.
+            cache_ttl: Время жизни результата в кэше типов тестов (секунды).
         """
         self.host = host
         self.port = port
         self.timeout = timeout
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.type_cache = TubeTypeCache(ttl=cache_ttl)
         logger.info(f"LISClient инициализирован: {host}:{port}, workers={max_workers}, timeout={timeout}s")
 
     def get_tube_info(self, barcode: str) -> Optional[Dict]:
@@ -219,8 +328,9 @@ class LISClient:
     def get_tube_types_batch(self, barcodes: List[str]) -> Dict[str, TestType]:
         """Получает типы тестов для списка баркодов параллельно.
 
-        Отправляет запросы к ЛИС для всех баркодов одновременно
-        через ThreadPoolExecutor. При ошибке отдельного запроса
+        Баркоды, найденные в кэше, обслуживаются без обращения к ЛИС;
+        для остальных запросы отправляются одновременно через
+        ThreadPoolExecutor. При ошибке отдельного запроса
         соответствующий баркод получает тип TestType.ERROR.
 
         Args:
@@ -232,22 +342,35 @@ class LISClient:
         if not barcodes:
             return {}
 
-        logger.info(f"Запрос типов тестов для {len(barcodes)} баркодов")
+        # Разделяем баркоды на найденные в кэше и требующие запроса
+        results = {}
+        uncached = []
+        for bc in barcodes:
+            cached = self.type_cache.get(bc)
+            if cached is not None:
+                results[bc] = cached[0]
+            else:
+                uncached.append(bc)
+
+        logger.info(
+            f"Запрос типов тестов для {len(uncached)} баркодов "
+            f"(из кэша: {len(results)})"
+        )
 
-        # Создаём задачи для всех баркодов
+        # Создаём задачи для баркодов, которых нет в кэше
         future_to_barcode = {
             self.executor.submit(get_tube_info_sync, bc, self.host, self.port, self.timeout): bc
-            for bc in barcodes
+            for bc in uncached
         }
 
-        results = {}
         for future in as_completed(future_to_barcode):
             barcode = future_to_barcode[future]
             try:
                 response = future.result()
-                test_type, _ = parse_test_type(response)
+                test_type, raw_tests = parse_test_type(response)
+                self.type_cache.put(barcode, test_type, raw_tests)
                 results[barcode] = test_type
-                logger.debug(f"{barcode} -> {test_type.name}")
+                logger.debug("%s -> %s", barcode, test_type.name)
             except Exception as e:
                 logger.error(f"Ошибка обработки {barcode}: {e}")
                 results[barcode] = TestType.ERROR
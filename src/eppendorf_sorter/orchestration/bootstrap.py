@@ -13,7 +13,8 @@
 import threading
 import logging
 import time
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from src.eppendorf_sorter.logging import (
     create_logger,
@@ -39,7 +40,7 @@ from src.eppendorf_sorter.domain.racks import (
     RackSystemManager,
 )
 
-from src.eppendorf_sorter.lis import LISClient
+from src.eppendorf_sorter.lis import LISClient, TubeTypeCache
 from src.eppendorf_sorter.orchestration.robot_logic import (
     RobotThread,
     LISRequestThread,
@@ -238,7 +239,9 @@ def initialize_pipeline_context(stop_event: threading.Event, logger: logging.Log
 def initialize_lis_thread(
     context: PipelineContext,
     config,
-    logger: logging.Logger
+    logger: logging.Logger,
+    executor: Optional[ThreadPoolExecutor] = None,
+    type_cache: Optional[TubeTypeCache] = None,
 ) -> LISRequestThread:
     """Инициализирует поток запросов к ЛИС.
 
@@ -249,6 +252,10 @@ def initialize_lis_thread(
         context: Контекст межпоточного взаимодействия с очередями и событиями.
         config: Конфигурация робота (содержит LIS-настройки: ip, port).
         logger: Логгер для вывода информации.
+        executor: Общий пул потоков для запросов к ЛИС (например,
+            пул LISClient). Если не передан, поток создаёт свой пул.
+        type_cache: Общий кэш результатов ЛИС (например, кэш LISClient).
+            Если не передан, поток создаёт свой кэш.
 
     Returns:
         Настроенный LISRequestThread (не запущенный).
@@ -259,8 +266,11 @@ def initialize_lis_thread(
         lis_port=config.lis.port,
         logger=logger,
         max_workers=10,
+        executor=executor,
+        type_cache=type_cache,
     )
-    logger.info(f"✓ LISRequestThread инициализирован (host={config.lis.ip}:{config.lis.port}, workers=10)")
+    workers = "общий пул" if executor is not None else "workers=10"
+    logger.info(f"✓ LISRequestThread инициализирован (host={config.lis.ip}:{config.lis.port}, {workers})")
     return lis_thread
 
 
@@ -319,7 +329,8 @@ def run_workcell():
     lis_client = LISClient(
         host=config.lis.ip,
         port=config.lis.port,
-        max_workers=30
+        max_workers=30,
+        cache_ttl=config.lis.cache_ttl,
     )
     loggers["robot"].info("✓ LIS клиент инициализирован (workers=30)")
 
@@ -328,7 +339,15 @@ def run_workcell():
     context = initialize_pipeline_context(stop_event, loggers["robot"])
 
     # --- Инициализация LISRequestThread ---
-    lis_thread = initialize_lis_thread(context, config, loggers["robot"])
+    # Запросы потока выполняются в пуле LIS клиента и используют его кэш -
+    # один пул и один кэш на все обращения к ЛИС вместо двух независимых
+    lis_thread = initialize_lis_thread(
+        context,
+        config,
+        loggers["robot"],
+        executor=lis_client.executor,
+        type_cache=lis_client.type_cache,
+    )
 
     # --- Создание главного потока обработки (RobotThread) ---
     loggers["robot"].info("\nСоздание главного потока обработки...")
@@ -379,18 +398,10 @@ def run_workcell():
         # --- Процедура корректного завершения ---
         loggers["robot"].info("\nНачало процедуры остановки...")
 
-        # Останавливаем LISRequestThread executor
-        loggers["robot"].info("Остановка LISRequestThread executor...")
-        try:
-            lis_thread.shutdown()
-            loggers["robot"].info("✓ LISRequestThread executor остановлен")
-        except Exception as e:
-            loggers["robot"].error(f"❌ Ошибка остановки LISRequestThread executor: {e}")
-
         # Общий shutdown потоков
         shutdown(stop_event=stop_event, threads=threads, logger=loggers["robot"])
 
-        # Останавливаем LIS клиент
+        # Останавливаем LIS клиент (вместе с общим пулом LISRequestThread)
         loggers["robot"].info("Остановка LIS клиента...")
         try:
             lis_client.shutdown()
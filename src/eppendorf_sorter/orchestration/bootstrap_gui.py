@@ -88,6 +88,7 @@ class GUIController:
         gui.set_pause_callback(self._on_pause)
         gui.set_resume_callback(self._on_resume)
         gui.set_rack_replaced_callback(self._on_rack_replaced)
+        gui.set_clear_lis_cache_callback(self._on_clear_lis_cache)
 
     def _initialize_rack_manager(self) -> RackSystemManager:
         """Создаёт и настраивает менеджер штативов.
@@ -185,7 +186,7 @@ class GUIController:
                 rack = self._rack_manager.get_destination_rack(rack_id)
                 if rack:
                     rack.set_target(target)
-                    self.logger.debug(f"Применено целевое значение {target} для штатива #{rack_id}")
+                    self.logger.debug("Применено целевое значение %d для штатива #%d", target, rack_id)
 
             self.gui.set_rack_manager(self._rack_manager)
             self.logger.info("RackSystemManager инициализирован")
@@ -198,7 +199,8 @@ class GUIController:
             self._lis_client = LISClient(
                 host=config.lis.ip,
                 port=config.lis.port,
-                max_workers=5
+                max_workers=10,
+                cache_ttl=config.lis.cache_ttl,
             )
             self.logger.info("LIS клиент инициализирован")
 
@@ -212,7 +214,8 @@ class GUIController:
                 lis_host=config.lis.ip,
                 lis_port=config.lis.port,
                 logger=self.logger,
-                max_workers=10,
+                executor=self._lis_client.executor,
+                type_cache=self._lis_client.type_cache,
             )
             self.logger.info("LISRequestThread инициализирован")
 
@@ -353,6 +356,18 @@ class GUIController:
         if self._robot_thread:
             self._robot_thread.confirm_rack_replaced()
 
+    def _on_clear_lis_cache(self):
+        """Обработчик сброса кэша результатов ЛИС из GUI.
+
+        Очищает общий кэш LISClient: пробирки, тесты которых изменились
+        в ЛИС, будут запрошены заново, не дожидаясь истечения lis.cache_ttl.
+        """
+        if not self._lis_client:
+            return
+
+        self._lis_client.type_cache.clear()
+        self.logger.info("Кэш результатов ЛИС очищен оператором")
+
     def _cleanup(self):
         """Освобождает все ресурсы: LIS клиент, робот, сканер, контекст.
 
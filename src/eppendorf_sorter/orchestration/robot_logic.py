@@ -41,19 +41,23 @@ SCANNING_ITERATION:
 import time
 import threading
 import logging
+from collections import Counter, deque
+from enum import Enum
 from queue import Queue, Empty
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
 
-from src.eppendorf_sorter.devices import CellRobot, Scanner
+from src.eppendorf_sorter.devices import NO_READ, CellRobot, Scanner
 from src.eppendorf_sorter.config.robot_config import load_robot_config
 from src.eppendorf_sorter.domain.racks import (
+    DestinationRack,
     RackSystemManager,
     TestType,
     TubeInfo,
 )
-from src.eppendorf_sorter.lis import LISClient
+from src.eppendorf_sorter.lis import LISClient, TubeTypeCache
 from src.eppendorf_sorter.lis.client import get_tube_info_sync, parse_test_type
 from .robot_protocol import NR, NR_VAL, SR, SR_VAL
 
@@ -62,10 +66,80 @@ ROBOT_CFG = load_robot_config()
 SCANNER_CFG = ROBOT_CFG.scanner
 LIS_CFG = ROBOT_CFG.lis
 
+# Страховочный интервал повторной проверки stop_event при ожидании оператора:
+# stop_event может быть установлен снаружи без уведомления условия
+STOP_CHECK_INTERVAL = 0.5
+
+# Опрос регистров робота: первый интервал и множитель его роста до
+# максимального интервала, заданного в _wait_register / _wait_until
+POLL_INITIAL_INTERVAL = 0.005
+POLL_BACKOFF_FACTOR = 1.5
+
+# Адаптивное размещение опросов: по последним наблюдённым длительностям
+# ожидания каждого перехода регистра первый опрос откладывается на долю
+# минимальной из них - раньше переход почти никогда не происходит
+WAIT_HISTORY_SIZE = 20
+WAIT_HISTORY_MIN_SAMPLES = 3
+WAIT_QUIET_FRACTION = 0.8
+
+# Максимальное время ожидания смены состояния программ и сброса тревог
+# робота при запуске
+PROGRAM_STATE_TIMEOUT = 2.0
+
+# Типы тестов, пробирки с которыми не сортируются (ошибка ЛИС / нет тестов)
+SKIPPED_TEST_TYPES = frozenset({TestType.ERROR, TestType.UNKNOWN})
+
+# Типы тестов, для каждого из которых перед циклом нужен свободный штатив
+REQUIRED_TEST_TYPES = (TestType.UGI, TestType.VPCH, TestType.UGI_VPCH, TestType.OTHER)
+
+# Раскладка сканирования исходного штатива 10x5: каждый ряд сканируется
+# двумя группами колонок (col_start включительно, col_end не включительно)
+SOURCE_RACK_ROWS = 10
+SOURCE_RACK_COLS = 5
+SCAN_COLUMN_GROUPS = ((0, 3), (3, 5))
+
+# Номера позиций для каждой пары (ряд, первая колонка группы) считаются
+# один раз при импорте, а не на каждой итерации сканирования
+SCAN_POSITIONS = {
+    (row, col_start): tuple(
+        row * SOURCE_RACK_COLS + col for col in range(col_start, col_end)
+    )
+    for row in range(SOURCE_RACK_ROWS)
+    for col_start, col_end in SCAN_COLUMN_GROUPS
+}
+
+# Двузначные поля строковых регистров ("07") для значений 0-99: номера
+# паллетов, штативов и позиций берутся из таблицы без форматирования
+TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
+
+# Разделитель баннеров фаз и режимов в логе
+BANNER_RULE = "=" * 60
+
+# Баннер режима ожидания собирается один раз и пишется одним вызовом логгера
+WAITING_MODE_BANNER = (
+    "\n" + BANNER_RULE + "\n"
+    "⏸ РЕЖИМ ОЖИДАНИЯ\n"
+    "Причина: %s\n"
+    + BANNER_RULE + "\n"
+)
+
 
 # ==================== СТРУКТУРЫ ДАННЫХ ====================
 
-@dataclass
+class OperatorSignal(Enum):
+    """Последний сигнал оператора, которого ждёт RobotThread.
+
+    Attributes:
+        NONE: Сигнала нет.
+        RESUME: Продолжение работы после паузы.
+        RACK_REPLACED: Подтверждение замены штатива.
+    """
+    NONE = "none"
+    RESUME = "resume"
+    RACK_REPLACED = "rack_replaced"
+
+
+@dataclass(slots=True)
 class ScanResult:
     """Результат сканирования одной пробирки для передачи между потоками.
 
@@ -94,6 +168,7 @@ class PipelineContext:
         pause_event: Событие паузы для приостановки обработки.
         sent_to_lis: Счётчик отправленных запросов в ЛИС.
         received_from_lis: Счётчик полученных ответов от ЛИС.
+        test_type_counts: Число полученных от ЛИС пробирок по типам теста.
         counter_lock: Lock для потокобезопасного доступа к счётчикам.
         all_scanned_tubes: Полный список всех отсканированных пробирок.
         tubes_lock: Lock для потокобезопасного доступа к списку пробирок.
@@ -123,6 +198,9 @@ class PipelineContext:
     # Счётчик полученных от ЛИС
     received_from_lis: int = 0
 
+    # Счётчик полученных от ЛИС по типам теста (для статистики цикла)
+    test_type_counts: Counter = field(default_factory=Counter)
+
     # Lock для счётчиков
     counter_lock: threading.Lock = field(default_factory=threading.Lock)
 
@@ -158,6 +236,7 @@ class PipelineContext:
         with self.counter_lock:
             self.sent_to_lis = 0
             self.received_from_lis = 0
+            self.test_type_counts = Counter()
 
         # --- Очистка списка пробирок ---
         with self.tubes_lock:
@@ -168,10 +247,33 @@ class PipelineContext:
         with self.counter_lock:
             self.sent_to_lis += 1
 
-    def increment_received(self):
-        """Потокобезопасно увеличивает счётчик полученных ответов от ЛИС."""
+    def increment_received(self, test_type: TestType):
+        """Потокобезопасно учитывает полученный ответ от ЛИС.
+
+        Args:
+            test_type: Тип теста, определённый для пробирки.
+        """
         with self.counter_lock:
             self.received_from_lis += 1
+            self.test_type_counts[test_type] += 1
+
+    def get_test_type_counts(self) -> Counter:
+        """Возвращает копию счётчика пробирок по типам теста.
+
+        Пробирки, ответ для которых ещё не получен, учитываются
+        как UNKNOWN.
+
+        Returns:
+            Counter с числом пробирок каждого типа на момент вызова.
+        """
+        with self.counter_lock:
+            counts = self.test_type_counts.copy()
+            received = self.received_from_lis
+        with self.tubes_lock:
+            not_received = len(self.all_scanned_tubes) - received
+        if not_received > 0:
+            counts[TestType.UNKNOWN] += not_received
+        return counts
 
     def add_scanned_tube(self, tube: TubeInfo):
         """Потокобезопасно добавляет отсканированную пробирку в общий список.
@@ -182,6 +284,15 @@ class PipelineContext:
         with self.tubes_lock:
             self.all_scanned_tubes.append(tube)
 
+    def add_scanned_tubes(self, tubes: List[TubeInfo]):
+        """Потокобезопасно добавляет группу отсканированных пробирок.
+
+        Args:
+            tubes: Пробирки для добавления.
+        """
+        with self.tubes_lock:
+            self.all_scanned_tubes.extend(tubes)
+
     def get_all_scanned_tubes(self) -> List[TubeInfo]:
         """Возвращает потокобезопасную копию списка всех отсканированных пробирок.
 
@@ -212,7 +323,10 @@ class LISRequestThread(threading.Thread):
         logger: Логгер для записи событий потока.
         max_workers: Максимальное число параллельных запросов к ЛИС.
         timeout: Таймаут одного запроса к ЛИС в секундах.
-        executor: Пул потоков для параллельного выполнения запросов.
+        executor: Пул потоков для параллельного выполнения запросов
+            (собственный или общий с LISClient).
+        type_cache: Кэш результатов ЛИС по баркоду (живёт между циклами,
+            обычно общий с LISClient).
     """
 
     def __init__(
@@ -223,6 +337,8 @@ class LISRequestThread(threading.Thread):
         logger: logging.Logger,
         max_workers: int = 20,
         timeout: float = 60.0,
+        executor: Optional[ThreadPoolExecutor] = None,
+        type_cache: Optional[TubeTypeCache] = None,
     ):
         """Инициализирует поток запросов к ЛИС.
 
@@ -231,8 +347,14 @@ class LISRequestThread(threading.Thread):
             lis_host: IP-адрес сервера ЛИС.
             lis_port: Порт сервера ЛИС.
             logger: Логгер для записи событий.
-            max_workers: Максимальное число параллельных запросов.
+            max_workers: Максимальное число параллельных запросов
+                (используется, только если ``executor`` не передан).
             timeout: Таймаут одного запроса к ЛИС в секундах.
+            executor: Общий пул потоков для запросов к ЛИС. Если не
+                передан, поток создаёт собственный пул.
+            type_cache: Общий кэш результатов ЛИС (например,
+                ``LISClient.type_cache``). Если не передан, поток
+                создаёт собственный кэш.
         """
         super().__init__(name="LISRequestThread", daemon=True)
         self.context = context
@@ -241,7 +363,119 @@ class LISRequestThread(threading.Thread):
         self.logger = logger
         self.max_workers = max_workers
         self.timeout = timeout
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Общий пул останавливает его владелец, собственный - shutdown()
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+        self.type_cache = type_cache if type_cache is not None else TubeTypeCache()
+
+        # Незавершённые запросы. Ответ обрабатывается колбэком future сразу
+        # по готовности, поэтому пробирка попадает в ready_to_sort_queue
+        # без задержки на опрос future.done() в основном цикле
+        self._pending: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+
+        # Пробирки, ожидающие ответа по уже отправленному баркоду. Повторный
+        # баркод (контроли, перезапуски) не порождает второй запрос к ЛИС,
+        # а получает результат первого. Защищено _pending_lock
+        self._waiting: Dict[str, List[TubeInfo]] = {}
+
+    def _submit_request(self, scan_result: ScanResult):
+        """Отправляет запрос к ЛИС в executor и регистрирует колбэк ответа.
+
+        Если результат для баркода уже есть в кэше, пробирка сразу
+        передаётся на сортировку без обращения к ЛИС. Если запрос по этому
+        баркоду уже выполняется, пробирка ждёт его ответа.
+
+        Args:
+            scan_result: Отсканированная пробирка для запроса.
+        """
+        tube = scan_result.tube
+        cached = self.type_cache.get(tube.barcode)
+        if cached is not None:
+            self.context.increment_sent()
+            self.logger.debug("[LIS] %s найден в кэше", tube.barcode)
+            self._apply_result(tube, *cached)
+            return
+
+        with self._pending_lock:
+            waiting = self._waiting.get(tube.barcode)
+            if waiting is not None:
+                waiting.append(tube)
+            else:
+                self._waiting[tube.barcode] = [tube]
+        self.context.increment_sent()
+
+        if waiting is not None:
+            self.logger.debug("[LIS] %s уже запрошен, ожидаем ответ", tube.barcode)
+            return
+
+        future = self.executor.submit(
+            get_tube_info_sync,
+            tube.barcode,
+            self.lis_host,
+            self.lis_port,
+            self.timeout
+        )
+        with self._pending_lock:
+            self._pending.add(future)
+        self.logger.debug("[LIS] Отправлен запрос для %s", tube.barcode)
+
+        future.add_done_callback(partial(self._on_response, tube.barcode))
+
+    def _on_response(self, barcode: str, future: Future):
+        """Применяет ответ ЛИС к пробиркам с баркодом и передаёт их на сортировку.
+
+        Вызывается в потоке executor по завершении запроса.
+
+        Args:
+            barcode: Баркод, по которому выполнялся запрос.
+            future: Завершённый запрос к ЛИС.
+        """
+        try:
+            try:
+                response = future.result()
+                test_type, raw_tests = parse_test_type(response)
+            except Exception as e:
+                self.logger.error("[LIS] Ошибка запроса для %s: %s", barcode, e)
+                test_type = TestType.ERROR
+                raw_tests = []
+
+            self.type_cache.put(barcode, test_type, raw_tests)
+            with self._pending_lock:
+                tubes = self._waiting.pop(barcode, [])
+            for tube in tubes:
+                self._apply_result(tube, test_type, list(raw_tests))
+        finally:
+            # Снимаем с учёта только после постановки в очередь, чтобы
+            # lis_complete не был установлен раньше последней пробирки
+            with self._pending_lock:
+                self._pending.discard(future)
+
+    def _apply_result(self, tube: TubeInfo, test_type: TestType, raw_tests: List[str]):
+        """Записывает результат ЛИС в пробирку и ставит её в очередь сортировки.
+
+        Args:
+            tube: Пробирка, для которой получен результат.
+            test_type: Определённый тип теста.
+            raw_tests: Сырые названия тестов из ответа ЛИС.
+        """
+        # Обновляем тип теста и сырые тесты
+        tube.test_type = test_type
+        tube.raw_tests = raw_tests
+        self.context.increment_received(test_type)
+
+        # Кладём в очередь готовых к сортировке
+        self.context.ready_to_sort_queue.put(tube)
+        self.logger.info("[LIS] %s -> %s (raw: %s)", tube.barcode, test_type.name, raw_tests)
+
+    def _has_pending(self) -> bool:
+        """Проверяет наличие незавершённых запросов к ЛИС.
+
+        Returns:
+            True если хотя бы один запрос ещё выполняется.
+        """
+        with self._pending_lock:
+            return bool(self._pending)
 
     def run(self):
         """Основной цикл потока: обработка очереди баркодов до stop_event.
@@ -249,90 +483,52 @@ class LISRequestThread(threading.Thread):
         Цикл непрерывно:
         1. Проверяет паузу.
         2. Берёт баркод из barcode_queue и отправляет запрос в executor.
-        3. Собирает завершённые future и кладёт результаты в ready_to_sort_queue.
-        4. При scanning_complete и пустой очереди устанавливает lis_complete.
+        3. При scanning_complete и отсутствии незавершённых запросов
+           устанавливает lis_complete.
+
+        Ответы обрабатываются колбэками (см. ``_on_response``).
         """
         self.logger.info("[LIS] Поток запущен")
 
-        pending_futures: Dict = {}  # future -> ScanResult
+        # Методы событий и очереди связываются один раз: цикл крутится
+        # каждые 100 мс всё время работы потока
+        context = self.context
+        stop_is_set = context.stop_event.is_set
+        stop_wait = context.stop_event.wait
+        pause_is_set = context.pause_event.is_set
+        scanning_complete_is_set = context.scanning_complete.is_set
+        barcode_queue = context.barcode_queue
 
         try:
-            while not self.context.stop_event.is_set():
+            while not stop_is_set():
                 # --- Проверка паузы ---
-                if self.context.pause_event.is_set():
-                    time.sleep(0.1)
+                if pause_is_set():
+                    # Ожидание прерывается остановкой сразу
+                    stop_wait(0.1)
                     continue
 
                 # --- Получение нового баркода из очереди ---
                 try:
-                    scan_result: ScanResult = self.context.barcode_queue.get(timeout=0.1)
-
-                    # Отправляем запрос в executor
-                    future = self.executor.submit(
-                        get_tube_info_sync,
-                        scan_result.tube.barcode,
-                        self.lis_host,
-                        self.lis_port,
-                        self.timeout
-                    )
-                    pending_futures[future] = scan_result
-                    self.context.increment_sent()
-                    self.logger.debug(f"[LIS] Отправлен запрос для {scan_result.tube.barcode}")
-
+                    scan_result: ScanResult = barcode_queue.get(timeout=0.1)
+                    self._submit_request(scan_result)
                 except Empty:
                     pass
 
-                # --- Обработка завершённых запросов ---
-                completed = []
-                for future in pending_futures:
-                    if future.done():
-                        completed.append(future)
-
-                for future in completed:
-                    scan_result = pending_futures.pop(future)
-                    try:
-                        response = future.result()
-                        test_type, raw_tests = parse_test_type(response)
-                    except Exception as e:
-                        self.logger.error(f"[LIS] Ошибка запроса для {scan_result.tube.barcode}: {e}")
-                        test_type = TestType.ERROR
-                        raw_tests = []
-
-                    # Обновляем тип теста и сырые тесты
-                    scan_result.tube.test_type = test_type
-                    scan_result.tube.raw_tests = raw_tests
-                    self.context.increment_received()
-
-                    # Кладём в очередь готовых к сортировке
-                    self.context.ready_to_sort_queue.put(scan_result.tube)
-                    self.logger.info(f"[LIS] {scan_result.tube.barcode} -> {test_type.name} (raw: {raw_tests})")
-
                 # --- Проверка завершения цикла ---
-                if self.context.scanning_complete.is_set():
+                if scanning_complete_is_set():
                     # Сканирование завершено, ждём завершения всех pending запросов
-                    if not pending_futures and self.context.barcode_queue.empty():
+                    if not self._has_pending() and barcode_queue.empty():
                         # Цикл завершён - сигнализируем и ждём следующий
                         if not self.context.lis_complete.is_set():
                             self.context.lis_complete.set()
                             self.logger.info("[LIS] Цикл завершён, ожидание следующего цикла...")
 
             # --- Завершение: дожидаемся pending запросов при остановке ---
-            if pending_futures:
-                self.logger.info(f"[LIS] Завершение {len(pending_futures)} pending запросов...")
-                for future in as_completed(pending_futures.keys()):
-                    scan_result = pending_futures[future]
-                    try:
-                        response = future.result(timeout=5.0)
-                        test_type, raw_tests = parse_test_type(response)
-                    except Exception as e:
-                        self.logger.error(f"[LIS] Ошибка запроса для {scan_result.tube.barcode}: {e}")
-                        test_type = TestType.ERROR
-                        raw_tests = []
-
-                    scan_result.tube.test_type = test_type
-                    scan_result.tube.raw_tests = raw_tests
-                    self.context.increment_received()
-                    self.context.ready_to_sort_queue.put(scan_result.tube)
+            with self._pending_lock:
+                pending = list(self._pending)
+            if pending:
+                self.logger.info(f"[LIS] Завершение {len(pending)} pending запросов...")
+                wait(pending)
 
         except Exception as e:
             self.logger.error(f"[LIS] Критическая ошибка: {e}", exc_info=True)
@@ -342,8 +538,12 @@ class LISRequestThread(threading.Thread):
             self.logger.info("[LIS] Поток завершён")
 
     def shutdown(self):
-        """Корректно завершает работу пула потоков executor."""
-        self.executor.shutdown(wait=False)
+        """Корректно завершает работу собственного пула потоков executor.
+
+        Общий пул, переданный в конструктор, не останавливается.
+        """
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
 
 
 # ==================== ОСНОВНОЙ ПОТОК РОБОТА ====================
@@ -399,6 +599,12 @@ class RobotThread(threading.Thread):
         self.lis_client = lis_client
         self.logger = logger
         self.stop_event = stop_event
+        # Связанный метод проверки остановки: вызывается после каждой операции
+        self._stop_is_set = stop_event.is_set
+
+        # Уровень пошаговой трассировки (сырые ответы сканера, маппинг,
+        # старт сортировки): INFO только при verbose_logging в конфиге
+        self._trace_level = logging.INFO if ROBOT_CFG.verbose_logging else logging.DEBUG
 
         # Контекст для межпоточного взаимодействия (инъекция из bootstrap)
         self.context = context
@@ -406,50 +612,200 @@ class RobotThread(threading.Thread):
         # Поток запросов к ЛИС (инъекция из bootstrap)
         self.lis_thread = lis_thread
 
-        # События для управления из GUI
-        self._pause_requested = threading.Event()  # Запрос на паузу
-        self._resume_event = threading.Event()     # Сигнал продолжения после паузы
-        self._rack_replaced_event = threading.Event()  # Сигнал замены штатива
-        self._stop_requested = threading.Event()   # Запрос на остановку (с уходом в home)
+        # Управление из GUI. Запросы паузы и остановки только проверяются
+        # между операциями и никогда не ожидаются - достаточно простых флагов
+        # (присваивание bool атомарно), Event нужен лишь там, где поток ждёт
+        self._pause_requested = False  # Запрос на паузу
+        self._stop_requested = False   # Запрос на остановку (с уходом в home)
+        # Сигнал оператора, которого ждёт поток, - одно состояние под общим
+        # условием: request_resume / confirm_rack_replaced / request_stop
+        # будят ожидание сразу
+        self._control_cond = threading.Condition()
+        self._operator_signal = OperatorSignal.NONE
         self._in_waiting_mode = False  # Флаг: робот в режиме ожидания
+        # Последние длительности ожидания по (регистр, значение) - для
+        # адаптивного размещения опросов в _wait_register
+        self._wait_history: Dict[Tuple[int, int], Deque[float]] = {}
 
     # ==================== ВСПОМОГАТЕЛЬНЫЕ МЕТОДЫ ====================
 
-    def _wait_until(self, condition, poll: float = 0.05) -> bool:
+    def _wait_until(
+        self,
+        condition,
+        poll: float = 0.05,
+        timeout: Optional[float] = None,
+    ) -> bool:
         """Ожидает выполнения условия с проверкой stop_event.
 
         Блокирует поток до тех пор, пока ``condition()`` не вернёт True
-        или не будет установлен stop_event.
+        или не будет установлен stop_event. Пауза между опросами выполняется
+        через ``stop_event.wait``, поэтому остановка прерывает ожидание
+        сразу, а не после очередного интервала опроса.
+
+        Интервал опроса растёт от ``POLL_INITIAL_INTERVAL`` до ``poll``,
+        как и в ``_wait_register``.
 
         Args:
             condition: Вызываемый объект без аргументов, возвращающий bool.
-            poll: Интервал опроса в секундах между проверками.
+            poll: Максимальный интервал опроса в секундах между проверками.
+            timeout: Максимальное время ожидания в секундах
+                (None - без ограничения).
 
         Returns:
-            True если условие выполнено, False если получен stop_event.
+            True если условие выполнено, False если получен stop_event
+            или истёк таймаут.
         """
-        while not self.stop_event.is_set():
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = min(POLL_INITIAL_INTERVAL, poll)
+
+        while not self._stop_is_set():
             try:
                 if condition():
                     return True
             except Exception as e:
-                self.logger.warning(f"Ошибка при проверке условия: {e}")
+                self.logger.warning("Ошибка при проверке условия: %s", e)
 
-            # Пауза между проверками
-            time.sleep(poll)
+            pause = interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                pause = min(pause, remaining)
+
+            # Пауза между проверками (прерывается установкой stop_event)
+            if self.stop_event.wait(pause):
+                break
+            interval = min(interval * POLL_BACKOFF_FACTOR, poll)
+
+        return False
+
+    def _wait_program_state(self, state: str, timeout: float) -> bool:
+        """Ожидает, пока программы робота перейдут в заданное состояние.
+
+        Args:
+            state: Ожидаемое состояние ('IDLE', 'RUNNING', 'PAUSED').
+            timeout: Максимальное время ожидания в секундах.
+
+        Returns:
+            True если состояние достигнуто, False при таймауте или stop_event.
+        """
+        get_state = self.robot.get_all_running_programms_states
+        result = self._wait_until(lambda: get_state() == state, timeout=timeout)
+        if not result and not self._stop_is_set():
+            self.logger.warning(
+                "Программы робота не перешли в состояние %s за %.1f с", state, timeout
+            )
+        return result
+
+    def _wait_alarms_cleared(self, timeout: float) -> bool:
+        """Ожидает, пока у робота не останется активных тревог.
+
+        Сброс тревог не гарантирует их мгновенного снятия на контроллере,
+        поэтому перед запуском программы дожидаемся пустого списка.
+
+        Args:
+            timeout: Максимальное время ожидания в секундах.
+
+        Returns:
+            True если тревог нет, False при таймауте или stop_event.
+        """
+        get_alarms = self.robot.get_all_active_alarms
+        result = self._wait_until(lambda: not get_alarms(), timeout=timeout)
+        if not result and not self._stop_is_set():
+            self.logger.warning("Тревоги робота не сброшены за %.1f с", timeout)
+        return result
+
+    def _wait_register(
+        self,
+        register: int,
+        expected: int,
+        poll: float = 0.05,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Ожидает, пока числовой регистр робота примет заданное значение.
+
+        Специализация ``_wait_until`` для самого частого случая: метод чтения
+        регистра связывается один раз, и каждый опрос сводится к одному
+        вызову и сравнению без промежуточной lambda.
+
+        Интервал опроса растёт от ``POLL_INITIAL_INTERVAL`` до ``poll``:
+        быстрые переходы регистра замечаются почти сразу, а долгие движения
+        робота не нагружают контроллер частыми запросами.
+
+        Если регистр не принял значение при первой проверке и для перехода
+        накоплена история длительностей, следующий опрос откладывается до
+        ``WAIT_QUIET_FRACTION`` от минимальной наблюдённой длительности -
+        так опросы сосредоточены там, где переход действительно ожидается.
+
+        Args:
+            register: Номер регистра R[].
+            expected: Ожидаемое значение регистра.
+            poll: Максимальный интервал опроса в секундах между проверками.
+            timeout: Максимальное время ожидания в секундах
+                (None - без ограничения).
+
+        Returns:
+            True если регистр принял значение, False если получен stop_event
+            или истёк таймаут.
+        """
+        get_nr = self.robot.get_number_register
+        stop_is_set = self._stop_is_set
+        stop_wait = self.stop_event.wait
+        started_at = time.monotonic()
+        deadline = None if timeout is None else started_at + timeout
+        interval = min(POLL_INITIAL_INTERVAL, poll)
+        history = self._wait_history.get((register, expected))
+        quiet = None
+        if history is not None and len(history) >= WAIT_HISTORY_MIN_SAMPLES:
+            quiet = WAIT_QUIET_FRACTION * min(history)
+
+        while not stop_is_set():
+            try:
+                if get_nr(register) == expected:
+                    self._record_wait(register, expected, time.monotonic() - started_at)
+                    return True
+            except Exception as e:
+                self.logger.warning("Ошибка чтения R[%d]: %s", register, e)
+
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                self.logger.warning("Таймаут ожидания R[%d] = %d", register, expected)
+                break
+
+            # Пауза между проверками (прерывается установкой stop_event).
+            # Первая пауза после неудачной проверки - до ожидаемого перехода
+            pause = interval
+            if quiet is not None:
+                pause = max(interval, started_at + quiet - now)
+                quiet = None
+            if deadline is not None:
+                pause = min(pause, max(deadline - now, 0.0))
+            if stop_wait(pause):
+                break
+            interval = min(interval * POLL_BACKOFF_FACTOR, poll)
 
         return False
 
+    def _record_wait(self, register: int, expected: int, elapsed: float):
+        """Запоминает длительность ожидания перехода регистра.
+
+        Args:
+            register: Номер регистра R[].
+            expected: Значение, которого дождались.
+            elapsed: Длительность ожидания в секундах.
+        """
+        history = self._wait_history.get((register, expected))
+        if history is None:
+            history = self._wait_history[(register, expected)] = deque(maxlen=WAIT_HISTORY_SIZE)
+        history.append(elapsed)
+
     def _wait_robot_ready(self) -> bool:
         """Ожидает готовности робота (R[1] = 0).
 
         Returns:
             True если робот готов, False если получен stop_event.
         """
-        result = self._wait_until(
-            lambda: self.robot.get_number_register(NR.iteration_starter) == NR_VAL.ready
-        )
-        return result
+        return self._wait_register(NR.iteration_starter, NR_VAL.ready)
 
     def _wait_scan_ready(self) -> bool:
         """Ожидает готовности робота к сканированию (R[2] = 1).
@@ -458,9 +814,7 @@ class RobotThread(threading.Thread):
             True если робот в позиции сканирования, False если получен stop_event.
         """
         self.logger.debug("Ожидание позиционирования (R[2] = 1)...")
-        result = self._wait_until(
-            lambda: self.robot.get_number_register(NR.scan_status) == NR_VAL.scan_good
-        )
+        result = self._wait_register(NR.scan_status, NR_VAL.scan_good)
         if result:
             self.logger.debug("Робот в позиции сканирования")
         return result
@@ -472,13 +826,67 @@ class RobotThread(threading.Thread):
             True если итерация завершена, False если получен stop_event.
         """
         self.logger.debug("Ожидание завершения итерации (R[1] = 2)...")
-        result = self._wait_until(
-            lambda: self.robot.get_number_register(NR.iteration_starter) == NR_VAL.completed
-        )
+        result = self._wait_register(NR.iteration_starter, NR_VAL.completed)
         if result:
             self.logger.debug("Итерация завершена")
         return result
 
+    def _start_iteration(self, iteration_type: str, data_register: int, data: str):
+        """Передаёт роботу данные итерации и запускает её.
+
+        Регистры пишутся по одному: сначала SR с данными, затем SR[1]
+        (тип итерации), затем R[1] = 1 - запуск всегда после того, как
+        данные записаны. SDK не поддерживает групповую запись регистров.
+
+        Args:
+            iteration_type: Значение SR[1] (тип итерации).
+            data_register: Номер строкового регистра с данными итерации.
+            data: Данные итерации для записи в ``data_register``.
+        """
+        self.robot.set_string_register(data_register, data)
+        self.logger.debug("SR[%d] = '%s'", data_register, data)
+
+        self.robot.set_string_register(SR.iteration_type, iteration_type)
+        self.logger.debug("SR[1: ITERATION_TYPE] = '%s'", iteration_type)
+
+        self.robot.set_number_register(NR.iteration_starter, NR_VAL.started)
+        self.logger.debug("R[1] = 1 (итерация запущена)")
+
+    def _wait_register_no_stop(
+        self,
+        register: int,
+        expected: int,
+        timeout: float,
+        poll: float = 0.1,
+    ) -> bool:
+        """Ожидает значения регистра R[] без проверки stop_event.
+
+        Используется при завершении работы, когда робот уже запущен
+        и нужно дождаться окончания его движения. Срок ожидания считается
+        по монотонным часам, поэтому не зависит от перевода системного
+        времени.
+
+        Args:
+            register: Номер регистра R[].
+            expected: Ожидаемое значение регистра.
+            timeout: Максимальное время ожидания в секундах.
+            poll: Интервал опроса в секундах между проверками.
+
+        Returns:
+            True если регистр принял значение, False при истечении таймаута.
+        """
+        get_nr = self.robot.get_number_register
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if get_nr(register) == expected:
+                    return True
+            except Exception as e:
+                self.logger.warning("Ошибка чтения R[%d]: %s", register, e)
+            time.sleep(poll)
+        self.logger.warning("Таймаут ожидания R[%d] = %d", register, expected)
+        return False
+
     def _wait_scan_ready_no_stop(self, timeout: float = 30.0) -> bool:
         """Ожидает готовности робота к сканированию (R[2] = 1) без проверки stop_event.
 
@@ -491,16 +899,7 @@ class RobotThread(threading.Thread):
         Returns:
             True если робот готов, False при истечении таймаута.
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                if self.robot.get_number_register(NR.scan_status) == NR_VAL.scan_good:
-                    return True
-            except Exception as e:
-                self.logger.warning(f"Ошибка чтения R[2]: {e}")
-            time.sleep(0.1)
-        self.logger.warning("Таймаут ожидания R[2] = 1")
-        return False
+        return self._wait_register_no_stop(NR.scan_status, NR_VAL.scan_good, timeout)
 
     def _wait_iteration_complete_no_stop(self, timeout: float = 30.0) -> bool:
         """Ожидает завершения итерации (R[1] = 2) без проверки stop_event.
@@ -514,16 +913,7 @@ class RobotThread(threading.Thread):
         Returns:
             True если итерация завершена, False при истечении таймаута.
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                if self.robot.get_number_register(NR.iteration_starter) == NR_VAL.completed:
-                    return True
-            except Exception as e:
-                self.logger.warning(f"Ошибка чтения R[1]: {e}")
-            time.sleep(0.1)
-        self.logger.warning("Таймаут ожидания R[1] = 2")
-        return False
+        return self._wait_register_no_stop(NR.iteration_starter, NR_VAL.completed, timeout)
 
     def _parse_barcodes(self, raw_barcode: str) -> List[str]:
         """Парсит строку с баркодами, разделёнными символом ';'.
@@ -542,12 +932,17 @@ class RobotThread(threading.Thread):
         if not raw_barcode:
             return []
 
+        # Быстрый путь: одиночный ответ без разделителей (в т.ч. "NoRead")
+        # не требует разбиения и обрезки краёв; сырой ответ и результат
+        # уже попадают в лог [SCAN RAW] / [MAPPING]
+        if ';' not in raw_barcode:
+            barcode = raw_barcode.strip()
+            return [barcode] if barcode and barcode != NO_READ else []
+
         # Разделяем по ';' и очищаем
         barcodes = [b.strip() for b in raw_barcode.split(';')]
 
-        self.logger.info(
-            f"[PARSE] split по ';' -> {len(barcodes)} элементов: {barcodes}"
-        )
+        self.logger.debug("[PARSE] split по ';' -> %d элементов: %s", len(barcodes), barcodes)
 
         # Убираем пустые элементы от лишних ';' в начале и конце строки
         while barcodes and not barcodes[0]:
@@ -558,12 +953,12 @@ class RobotThread(threading.Thread):
         if not barcodes:
             return []
 
-        self.logger.info(f"[PARSE] после trim пустых краёв -> {barcodes}")
+        self.logger.debug("[PARSE] после trim пустых краёв -> %s", barcodes)
 
-        # Заменяем NoRead и пустые на "" (сохраняя позицию)
-        result = [("" if (not b or b == "NoRead") else b) for b in barcodes]
+        # Заменяем NoRead на "" (сохраняя позицию); пустые и так ""
+        result = [("" if b == NO_READ else b) for b in barcodes]
 
-        self.logger.info(f"[PARSE] после замены NoRead -> {result}")
+        self.logger.debug("[PARSE] после замены NoRead -> %s", result)
 
         # Если все позиции пустые — возвращаем пустой список
         if not any(result):
@@ -592,6 +987,9 @@ class RobotThread(threading.Thread):
         8. Ждём R[1] = 2 (итерация завершена).
         9. Робот сам сбрасывает R[1] = 0.
 
+        Разбор ответа сканера выполняется между шагами 7 и 8, пока робот
+        завершает движение.
+
         Args:
             pallet_id: ID паллета (1 или 2).
             row: Номер ряда (0-9).
@@ -601,42 +999,35 @@ class RobotThread(threading.Thread):
         Returns:
             Список TubeInfo для найденных пробирок. Пустые позиции пропускаются.
         """
-        positions = [row * 5 + col for col in range(col_start, col_end)]
+        positions = SCAN_POSITIONS[row, col_start]
         group_size = len(positions)
         first_position = positions[0]
 
         self.logger.debug(
-            f"Сканирование П{pallet_id} ряд {row} колонки {col_start}-{col_end-1} "
-            f"(позиции {positions})"
+            "Сканирование П%d ряд %d колонки %d-%d (позиции %s)",
+            pallet_id, row, col_start, col_end - 1, positions,
         )
 
         # --- Ожидание готовности робота ---
         if not self._wait_robot_ready():
-            self.logger.error(f"Робот не готов для сканирования П{pallet_id} ряд {row}")
+            self.logger.error("Робот не готов для сканирования П%d ряд %d", pallet_id, row)
             return []
 
-        # --- Установка регистров ---
-        scan_data = f"{pallet_id:02d} {first_position:02d}"
-        self.robot.set_string_register(SR.scan_data, scan_data)
-        self.logger.debug(f"SR[3: SCAN_DATA] = '{scan_data}'")
-
-        self.robot.set_string_register(SR.iteration_type, SR_VAL.scanning)
-        self.logger.debug(f"SR[1: ITERATION_TYPE] = '{SR_VAL.scanning}'")
-
-        # --- Запуск итерации ---
-        self.robot.set_number_register(NR.iteration_starter, NR_VAL.started)
-        self.logger.debug("R[1] = 1 (итерация запущена)")
+        # --- Установка регистров и запуск итерации ---
+        scan_data = f"{TWO_DIGITS[pallet_id]} {TWO_DIGITS[first_position]}"
+        self._start_iteration(SR_VAL.scanning, SR.scan_data, scan_data)
 
         # --- Ожидание позиционирования и сканирование ---
         scan_ready = self._wait_scan_ready()
 
         if scan_ready:
             raw_barcode, recv_time = self.scanner.scan(timeout=SCANNER_CFG.timeout)
-            self.logger.info(
-                f"[SCAN RAW] П{pallet_id} ряд={row} col={col_start}-{col_end-1} "
-                f"positions={positions} raw='{raw_barcode}' "
-                f"repr={repr(raw_barcode)} len={len(raw_barcode)} "
-                f"recv_time={recv_time:.3f}с"
+            self.logger.log(
+                self._trace_level,
+                "[SCAN RAW] П%d ряд=%d col=%d-%d positions=%s raw='%s' "
+                "repr=%r len=%d recv_time=%.3fс",
+                pallet_id, row, col_start, col_end - 1, positions, raw_barcode,
+                raw_barcode, len(raw_barcode), recv_time,
             )
 
             # Сигнализируем роботу что сканирование завершено
@@ -644,60 +1035,90 @@ class RobotThread(threading.Thread):
             self.logger.debug("R[2] = 0 (сканирование завершено)")
         else:
             # Остановка запрошена, но робот уже запущен - нужно дождаться и корректно завершить
-            self.logger.warning(f"Остановка во время позиционирования П{pallet_id} ряд {row}")
+            self.logger.warning("Остановка во время позиционирования П%d ряд %d", pallet_id, row)
             raw_barcode = ""
             # Ждём пока робот доедет (без проверки stop_event)
             self._wait_scan_ready_no_stop()
             # Сбрасываем R[2] = 0
             self.robot.set_number_register(NR.scan_status, NR_VAL.scan_reset)
 
+        # --- Парсинг и маппинг баркодов на позиции ---
+        # Выполняется, пока робот завершает итерацию после R[2] = 0
+        barcodes = self._parse_barcodes(raw_barcode)
+
+        self.logger.log(
+            self._trace_level,
+            "[MAPPING] barcodes(%d) -> positions(%d): barcodes=%s positions=%s",
+            len(barcodes), group_size, barcodes, positions,
+        )
+
+        if len(barcodes) > group_size:
+            self.logger.warning(
+                "Получено больше баркодов (%d) чем позиций (%d)", len(barcodes), group_size
+            )
+
+        # Лишние баркоды сверх числа позиций отбрасывает zip
+        mapping = list(zip(positions, barcodes))
+
+        # Лог маппинга по позициям - только если он будет записан
+        if self.logger.isEnabledFor(logging.INFO):
+            trace_level = self._trace_level
+            for i, (position, barcode) in enumerate(mapping):
+                self.logger.log(
+                    trace_level, "[MAPPING] i=%d barcode='%s' -> position=%d", i, barcode, position
+                )
+                if barcode:
+                    self.logger.info("✓ П%d[%d] -> %s", pallet_id, position, barcode)
+                else:
+                    # Пустая позиция (NoRead) — пропускаем, но позиция сохранена
+                    self.logger.debug("П%d[%d] - пусто (NoRead)", pallet_id, position)
+
+        # Создаём TubeInfo для каждого баркода (пустые строки = пустая позиция).
+        # Аргументы позиционные: (barcode, source_rack, number, test_type)
+        unknown = TestType.UNKNOWN
+        tubes = [
+            TubeInfo(barcode, pallet_id, position, unknown)
+            for position, barcode in mapping
+            if barcode
+        ]
+
+        # Логируем позиции за пределами ответа сканера (только при DEBUG)
+        if len(barcodes) < group_size and self.logger.isEnabledFor(logging.DEBUG):
+            for position in positions[len(barcodes):]:
+                self.logger.debug("П%d[%d] - пусто", pallet_id, position)
+
         # --- Завершение итерации ---
         self._wait_iteration_complete_no_stop()
 
         self.robot.set_number_register(NR.iteration_starter, NR_VAL.ready)
         self.logger.debug("R[1] = 0 (итерация сброшена)")
 
-        # --- Парсинг и маппинг баркодов на позиции ---
-        barcodes = self._parse_barcodes(raw_barcode)
-
-        self.logger.info(
-            f"[MAPPING] barcodes({len(barcodes)}) -> positions({group_size}): "
-            f"barcodes={barcodes} positions={positions}"
-        )
-
-        # Создаём TubeInfo для каждого баркода (пустые строки = пустая позиция)
-        tubes: List[TubeInfo] = []
+        return tubes
 
-        for i, barcode in enumerate(barcodes):
-            if i >= group_size:
-                self.logger.warning(f"Получено больше баркодов ({len(barcodes)}) чем позиций ({group_size})")
-                break
+    def _dispatch_scanned_tubes(self, pallet_id: int, tubes: List[TubeInfo]) -> int:
+        """Регистрирует отсканированные пробирки и отправляет их в ЛИС.
 
-            position = positions[i]
-            self.logger.info(f"[MAPPING] i={i} barcode='{barcode}' -> position={position}")
+        Группа добавляется в контекст и в исходный штатив пакетно (по одной
+        блокировке на группу), затем каждая пробирка ставится в barcode_queue.
 
-            if not barcode:
-                # Пустая позиция (NoRead) — пропускаем, но позиция сохранена
-                self.logger.debug(f"П{pallet_id}[{position}] - пусто (NoRead)")
-                continue
+        Args:
+            pallet_id: ID паллета, с которого отсканированы пробирки.
+            tubes: Пробирки группы с найденными баркодами.
 
-            self.logger.info(f"✓ П{pallet_id}[{position}] -> {barcode}")
+        Returns:
+            Количество обработанных пробирок.
+        """
+        if not tubes:
+            return 0
 
-            tube = TubeInfo(
-                barcode=barcode,
-                source_rack=pallet_id,
-                number=position,
-                test_type=TestType.UNKNOWN
-            )
-            tubes.append(tube)
+        self.context.add_scanned_tubes(tubes)
+        self.rack_manager.add_scanned_tubes_batch(pallet_id, tubes)
 
-        # Логируем позиции за пределами ответа сканера
-        if len(barcodes) < group_size:
-            for i in range(len(barcodes), group_size):
-                position = positions[i]
-                self.logger.debug(f"П{pallet_id}[{position}] - пусто")
+        put_barcode = self.context.barcode_queue.put
+        for tube in tubes:
+            put_barcode(ScanResult(tube=tube))
 
-        return tubes
+        return len(tubes)
 
     def _scan_all_source_racks(self) -> int:
         """Фаза 1: сканирование всех пробирок из исходных штативов.
@@ -712,9 +1133,7 @@ class RobotThread(threading.Thread):
         Returns:
             Количество отсканированных пробирок (с найденными баркодами).
         """
-        self.logger.info("\n" + "=" * 60)
-        self.logger.info("ФАЗА 1: СКАНИРОВАНИЕ ИСХОДНЫХ ШТАТИВОВ")
-        self.logger.info("=" * 60 + "\n")
+        self._log_banner("ФАЗА 1: СКАНИРОВАНИЕ ИСХОДНЫХ ШТАТИВОВ")
 
         total_scanned = 0
 
@@ -722,65 +1141,48 @@ class RobotThread(threading.Thread):
         source_pallets = self.rack_manager.get_all_source_pallets()
 
         for pallet in source_pallets:
-            if self.stop_event.is_set():
+            if self._stop_is_set():
                 break
 
             pallet_id = pallet.pallet_id
-            self.logger.info(f"\n--- Сканирование паллета П{pallet_id} (задержка 1с) ---")
-            time.sleep(1.0)
+            # Фиксированной задержки нет: первая группа сама ждёт готовности
+            # робота (R[1] = 0) в _scan_position_group
+            self.logger.info(f"\n--- Сканирование паллета П{pallet_id} ---")
 
-            # Занимаем паллет
-            pallet.occupy()
             pallet_tubes_count = 0
 
-            try:
+            # Занимаем паллет на время сканирования
+            with pallet.occupied():
                 # Сканируем 10 рядов
-                for row in range(10):
-                    if self.stop_event.is_set():
+                for row in range(SOURCE_RACK_ROWS):
+                    if self._stop_is_set():
                         break
 
-                    # --- Группа 1: колонки 0, 1, 2 (3 пробирки) ---
-                    tubes_group1 = self._scan_position_group(
-                        pallet_id, row, col_start=0, col_end=3
-                    )
-
-                    # Сразу отправляем в очередь для ЛИС
-                    for tube in tubes_group1:
-                        self.context.add_scanned_tube(tube)
-                        self.rack_manager.add_scanned_tube(pallet_id, tube)
-                        self.context.barcode_queue.put(ScanResult(tube=tube))
-                        pallet_tubes_count += 1
-
-                    # Проверка паузы
-                    if not self._handle_pause_check():
-                        break
+                    # --- Группы колонок ряда: 0-2 (3 пробирки), 3-4 (2 пробирки) ---
+                    interrupted = False
+                    for col_start, col_end in SCAN_COLUMN_GROUPS:
+                        tubes = self._scan_position_group(
+                            pallet_id, row, col_start=col_start, col_end=col_end
+                        )
 
-                    # --- Группа 2: колонки 3, 4 (2 пробирки) ---
-                    tubes_group2 = self._scan_position_group(
-                        pallet_id, row, col_start=3, col_end=5
-                    )
+                        # Сразу отправляем в очередь для ЛИС
+                        pallet_tubes_count += self._dispatch_scanned_tubes(pallet_id, tubes)
 
-                    # Сразу отправляем в очередь для ЛИС
-                    for tube in tubes_group2:
-                        self.context.add_scanned_tube(tube)
-                        self.rack_manager.add_scanned_tube(pallet_id, tube)
-                        self.context.barcode_queue.put(ScanResult(tube=tube))
-                        pallet_tubes_count += 1
+                        # Проверка паузы
+                        if not self._handle_pause_check():
+                            interrupted = True
+                            break
 
-                    # Проверка паузы
-                    if not self._handle_pause_check():
+                    if interrupted:
                         break
 
                     # Прогресс каждые 2 ряда
                     if (row + 1) % 2 == 0:
                         self.logger.info(
-                            f"П{pallet_id}: ряд {row + 1}/10, "
-                            f"найдено {pallet_tubes_count} пробирок"
+                            "П%d: ряд %d/%d, найдено %d пробирок",
+                            pallet_id, row + 1, SOURCE_RACK_ROWS, pallet_tubes_count,
                         )
 
-            finally:
-                pallet.release()
-
             total_scanned += pallet_tubes_count
             self.logger.info(
                 f"✓ Паллет П{pallet_id}: отсканировано {pallet_tubes_count} пробирок"
@@ -794,15 +1196,13 @@ class RobotThread(threading.Thread):
         else:
             self.logger.info(f"\n✓ Всего отсканировано: {total_scanned} пробирок")
 
-        self.logger.info(f"\n{'=' * 60}")
-        self.logger.info("✓ СКАНИРОВАНИЕ ЗАВЕРШЕНО")
-        self.logger.info(f"{'=' * 60}\n")
+        self._log_banner("✓ СКАНИРОВАНИЕ ЗАВЕРШЕНО")
 
         return total_scanned
 
     # ==================== ФАЗА СОРТИРОВКИ ====================
 
-    def _execute_sorting_iteration(self, tube: TubeInfo) -> bool:
+    def _execute_sorting_iteration(self, tube: TubeInfo, dest_rack: DestinationRack) -> bool:
         """Выполняет одну итерацию физической сортировки пробирки.
 
         Протокол взаимодействия с роботом:
@@ -815,23 +1215,20 @@ class RobotThread(threading.Thread):
 
         Args:
             tube: Информация о пробирке (баркод, источник, тип теста).
+            dest_rack: Целевой штатив, уже выбранный вызывающим кодом
+                через ``find_available_rack``.
 
         Returns:
             True если пробирка успешно размещена, False при ошибке.
         """
-        # --- Поиск целевого штатива ---
-        dest_rack = self.rack_manager.find_available_rack(tube.test_type)
-
-        if not dest_rack:
-            self.logger.error(f"Нет штативов для типа {tube.test_type.name}")
-            return False
-
         dest_rack_id = dest_rack.rack_id
         dest_position = dest_rack.get_next_position()
 
-        self.logger.info(
-            f"Сортировка: {tube.barcode} ({tube.test_type.name}) "
-            f"П{tube.source_rack}[{tube.number}] -> Штатив #{dest_rack_id}[{dest_position}]"
+        self.logger.log(
+            self._trace_level,
+            "Сортировка: %s (%s) П%d[%d] -> Штатив #%d[%d]",
+            tube.barcode, tube.test_type.name, tube.source_rack, tube.number,
+            dest_rack_id, dest_position,
         )
 
         # --- Ожидание готовности робота ---
@@ -839,22 +1236,14 @@ class RobotThread(threading.Thread):
             self.logger.error("Робот не готов для сортировки")
             return False
 
-        # --- Установка регистров ---
-        movement_data = (
-            f"{tube.source_rack:02d} "
-            f"{tube.number:02d} "
-            f"{dest_rack_id:02d} "
-            f"{dest_position:02d}"
-        )
-        self.robot.set_string_register(SR.movement_data, movement_data)
-        self.logger.debug(f"SR[2: MOVEMENT_DATA] = '{movement_data}'")
-
-        self.robot.set_string_register(SR.iteration_type, SR_VAL.sorting)
-        self.logger.debug(f"SR[1: ITERATION_TYPE] = '{SR_VAL.sorting}'")
-
-        # --- Запуск итерации ---
-        self.robot.set_number_register(NR.iteration_starter, NR_VAL.started)
-        self.logger.debug("R[1] = 1 (итерация запущена)")
+        # --- Установка регистров и запуск итерации ---
+        movement_data = " ".join((
+            TWO_DIGITS[tube.source_rack],
+            TWO_DIGITS[tube.number],
+            TWO_DIGITS[dest_rack_id],
+            TWO_DIGITS[dest_position],
+        ))
+        self._start_iteration(SR_VAL.sorting, SR.movement_data, movement_data)
 
         # --- Ожидание завершения ---
         iteration_ok = self._wait_iteration_complete()
@@ -873,8 +1262,9 @@ class RobotThread(threading.Thread):
         self.rack_manager.mark_tube_sorted(tube.source_rack, tube.barcode)
 
         self.logger.info(
-            f"✓ Пробирка размещена: Штатив #{dest_rack_id}[{tube.destination_number}] "
-            f"({dest_rack.get_tube_count()}/{dest_rack.MAX_TUBES})"
+            "✓ Пробирка размещена: Штатив #%d[%s] (%d/%d)",
+            dest_rack_id, tube.destination_number,
+            dest_rack.get_tube_count(), dest_rack.MAX_TUBES,
         )
 
         return True
@@ -891,15 +1281,13 @@ class RobotThread(threading.Thread):
             total_tubes: Общее количество пробирок для сортировки
                 (используется для отображения прогресса).
         """
-        self.logger.info("\n" + "=" * 60)
-        self.logger.info("ФАЗА 2: ФИЗИЧЕСКАЯ СОРТИРОВКА ПРОБИРОК")
-        self.logger.info("=" * 60 + "\n")
+        self._log_banner("ФАЗА 2: ФИЗИЧЕСКАЯ СОРТИРОВКА ПРОБИРОК")
 
         processed = 0
         failed = 0
         skipped = 0
 
-        while not self.stop_event.is_set():
+        while not self._stop_is_set():
             # --- Получение пробирки из очереди ---
             try:
                 tube: TubeInfo = self.context.ready_to_sort_queue.get(timeout=0.5)
@@ -910,8 +1298,8 @@ class RobotThread(threading.Thread):
                 continue
 
             # --- Пропуск ошибочных пробирок ---
-            if tube.test_type in [TestType.ERROR, TestType.UNKNOWN]:
-                self.logger.warning(f"Пропуск {tube.barcode} (тип: {tube.test_type.name})")
+            if tube.test_type in SKIPPED_TEST_TYPES:
+                self.logger.warning("Пропуск %s (тип: %s)", tube.barcode, tube.test_type.name)
                 skipped += 1
                 continue
 
@@ -919,72 +1307,77 @@ class RobotThread(threading.Thread):
             dest_rack = self.rack_manager.find_available_rack(tube.test_type)
 
             if not dest_rack:
-                self.logger.warning(f"Нет штативов для {tube.test_type.name}")
+                self.logger.warning("Нет штативов для %s", tube.test_type.name)
                 self._enter_waiting_mode(f"Заполнены штативы типа {tube.test_type.name}")
 
                 if not self._wait_for_rack_replacement():
-                    if self.stop_event.is_set():
+                    if self._stop_is_set():
                         break
                     continue
 
                 self._exit_waiting_mode()
-                self.rack_manager.reset_rack_pair(tube.test_type)
-
-                dest_rack = self.rack_manager.find_available_rack(tube.test_type)
+                dest_rack = self.rack_manager.reset_rack_pair(tube.test_type)
                 if not dest_rack:
-                    self.logger.error(f"После замены нет штативов для {tube.test_type.name}")
+                    self.logger.error("После замены нет штативов для %s", tube.test_type.name)
                     failed += 1
                     continue
 
             # --- Выполнение сортировки ---
-            if self._execute_sorting_iteration(tube):
+            if self._execute_sorting_iteration(tube, dest_rack):
                 processed += 1
                 total_done = processed + skipped + failed
                 if processed % 10 == 0 or total_done == total_tubes:
                     self.logger.info(
-                        f"Прогресс: {total_done}/{total_tubes} "
-                        f"(отсортировано: {processed}, пропущено: {skipped}, ошибок: {failed})"
+                        "Прогресс: %d/%d (отсортировано: %d, пропущено: %d, ошибок: %d)",
+                        total_done, total_tubes, processed, skipped, failed,
                     )
             else:
                 failed += 1
-                self.logger.warning(f"✗ Ошибка сортировки {tube.barcode}")
+                self.logger.warning("✗ Ошибка сортировки %s", tube.barcode)
 
             # Проверка паузы
             if not self._handle_pause_check():
                 break
 
-        self.logger.info(f"\n{'=' * 60}")
-        self.logger.info("СОРТИРОВКА ЗАВЕРШЕНА")
-        self.logger.info(f"Успешно: {processed}, Пропущено: {skipped}, Ошибок: {failed}")
-        self.logger.info(f"{'=' * 60}\n")
+        self._log_banner(
+            "СОРТИРОВКА ЗАВЕРШЕНА",
+            f"Успешно: {processed}, Пропущено: {skipped}, Ошибок: {failed}",
+        )
 
     # ==================== УПРАВЛЕНИЕ ИЗ GUI ====================
 
     def request_pause(self):
         """Запрашивает паузу робота (вызывается из GUI-потока)."""
-        self._pause_requested.set()
+        self._pause_requested = True
         self.logger.info("Пауза запрошена")
 
     def request_resume(self):
         """Запрашивает продолжение работы после паузы (вызывается из GUI-потока)."""
         # Отменяем запрос паузы если был
-        self._pause_requested.clear()
+        self._pause_requested = False
         # Сигнал продолжения
-        self._resume_event.set()
+        self._send_operator_signal(OperatorSignal.RESUME)
         self.logger.info("Продолжение запрошено")
 
     def confirm_rack_replaced(self):
         """Подтверждает замену штатива (вызывается из GUI-потока)."""
-        self._rack_replaced_event.set()
+        self._send_operator_signal(OperatorSignal.RACK_REPLACED)
         self.logger.info("Замена штатива подтверждена")
 
     def request_stop(self):
-        """Запрашивает остановку с уходом робота в home (вызывается из GUI-потока)."""
-        self._stop_requested.set()
+        """Запрашивает остановку с уходом робота в home (вызывается из GUI-потока).
+
+        Устанавливает stop_event и будит поток, если он ждёт оператора.
+        """
+        self._stop_requested = True
+        with self._control_cond:
+            self.stop_event.set()
+            self._control_cond.notify_all()
         self.logger.info("Остановка запрошена (робот уйдёт в home)")
 
+    @property
     def is_in_waiting_mode(self) -> bool:
-        """Проверяет, находится ли робот в режиме ожидания.
+        """Находится ли робот в режиме ожидания (чтение без вызова метода).
 
         Returns:
             True если робот в home и ожидает команды оператора.
@@ -993,6 +1386,37 @@ class RobotThread(threading.Thread):
 
     # ==================== РЕЖИМ ОЖИДАНИЯ ====================
 
+    def _send_operator_signal(self, signal: OperatorSignal):
+        """Сохраняет сигнал оператора и будит ожидающий поток.
+
+        Args:
+            signal: Полученный сигнал.
+        """
+        with self._control_cond:
+            self._operator_signal = signal
+            self._control_cond.notify_all()
+
+    def _clear_operator_signal(self):
+        """Сбрасывает ранее полученный сигнал оператора."""
+        with self._control_cond:
+            self._operator_signal = OperatorSignal.NONE
+
+    def _wait_operator_signal(self, expected: OperatorSignal) -> bool:
+        """Ожидает указанный сигнал оператора или остановку.
+
+        Args:
+            expected: Сигнал, которого ждёт поток.
+
+        Returns:
+            True если сигнал получен, False если установлен stop_event.
+        """
+        with self._control_cond:
+            while self._operator_signal is not expected and not self._stop_is_set():
+                self._control_cond.wait(timeout=STOP_CHECK_INTERVAL)
+            received = self._operator_signal is expected
+            self._operator_signal = OperatorSignal.NONE
+        return received
+
     def _handle_pause_check(self) -> bool:
         """Проверяет запрос на паузу и обрабатывает его.
 
@@ -1004,23 +1428,21 @@ class RobotThread(threading.Thread):
         Returns:
             True если можно продолжать работу, False если установлен stop_event.
         """
-        if not self._pause_requested.is_set():
-            return not self.stop_event.is_set()
+        if not self._pause_requested:
+            return not self._stop_is_set()
 
         # Сбрасываем запрос паузы
-        self._pause_requested.clear()
-        self._resume_event.clear()
+        self._pause_requested = False
+        self._clear_operator_signal()
 
         # Отправляем робота в home
         self._enter_waiting_mode("Пауза по команде оператора")
 
         # Ждём сигнала продолжения
         self.logger.info("Ожидание команды продолжения...")
-        while not self.stop_event.is_set():
-            if self._resume_event.wait(timeout=0.5):
-                self._resume_event.clear()
-                self._exit_waiting_mode()
-                return True
+        if self._wait_operator_signal(OperatorSignal.RESUME):
+            self._exit_waiting_mode()
+            return True
 
         return False
 
@@ -1036,10 +1458,7 @@ class RobotThread(threading.Thread):
         """
         self._in_waiting_mode = True
 
-        self.logger.warning(f"\n{'=' * 60}")
-        self.logger.warning(f"⏸ РЕЖИМ ОЖИДАНИЯ")
-        self.logger.warning(f"Причина: {reason}")
-        self.logger.warning(f"{'=' * 60}\n")
+        self.logger.warning(WAITING_MODE_BANNER, reason)
 
         # --- Ожидание готовности ---
         if not self._wait_robot_ready():
@@ -1050,7 +1469,7 @@ class RobotThread(threading.Thread):
         self.robot.set_number_register(NR.pause_status, NR_VAL.pause_not_ready)
 
         self.robot.set_string_register(SR.iteration_type, SR_VAL.pause)
-        self.logger.debug(f"SR[1] = '{SR_VAL.pause}'")
+        self.logger.debug("SR[1] = '%s'", SR_VAL.pause)
 
         # --- Запуск: робот поедет в home и будет ждать R[4] = 1 ---
         self.robot.set_number_register(NR.iteration_starter, NR_VAL.started)
@@ -1090,15 +1509,13 @@ class RobotThread(threading.Thread):
         Returns:
             True если получено подтверждение, False если установлен stop_event.
         """
-        self._rack_replaced_event.clear()
+        self._clear_operator_signal()
 
         self.logger.info("Ожидание замены штатива...")
 
-        while not self.stop_event.is_set():
-            if self._rack_replaced_event.wait(timeout=0.5):
-                self._rack_replaced_event.clear()
-                self.logger.info("✓ Замена штатива подтверждена")
-                return True
+        if self._wait_operator_signal(OperatorSignal.RACK_REPLACED):
+            self.logger.info("✓ Замена штатива подтверждена")
+            return True
 
         return False
 
@@ -1112,9 +1529,8 @@ class RobotThread(threading.Thread):
         self.logger.info("Отправка робота в home...")
 
         # --- Ожидание завершения текущей итерации ---
-        timeout = 30.0
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        deadline = time.monotonic() + 30.0
+        while time.monotonic() < deadline:
             try:
                 r1 = self.robot.get_number_register(NR.iteration_starter)
                 if r1 == NR_VAL.ready:
@@ -1145,15 +1561,7 @@ class RobotThread(threading.Thread):
         self.robot.set_number_register(NR.pause_status, NR_VAL.pause_ready)
 
         # Ждём завершения итерации (R[1] = 2)
-        timeout = 10.0
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                if self.robot.get_number_register(NR.iteration_starter) == NR_VAL.completed:
-                    break
-            except Exception as e:
-                self.logger.warning(f"Ошибка чтения регистра: {e}")
-            time.sleep(0.1)
+        self._wait_register_no_stop(NR.iteration_starter, NR_VAL.completed, timeout=10.0)
 
         # --- Сброс регистров ---
         self.robot.set_number_register(NR.iteration_starter, NR_VAL.ready)
@@ -1166,7 +1574,7 @@ class RobotThread(threading.Thread):
         Returns:
             True если остановка запрошена.
         """
-        return self._stop_requested.is_set()
+        return self._stop_requested
 
     # ==================== ВСПОМОГАТЕЛЬНЫЕ ====================
 
@@ -1179,11 +1587,9 @@ class RobotThread(threading.Thread):
             Кортеж (can_start, reason): True и пустая строка если можно
             начинать, False и описание причины если нельзя.
         """
-        required_types = [TestType.UGI, TestType.VPCH, TestType.UGI_VPCH, TestType.OTHER]
-
-        for test_type in required_types:
-            if not self.rack_manager.has_available_rack(test_type):
-                return False, f"Нет штативов для типа {test_type.name}"
+        missing = self.rack_manager.find_unavailable_type(REQUIRED_TEST_TYPES)
+        if missing is not None:
+            return False, f"Нет штативов для типа {missing.name}"
 
         return True, ""
 
@@ -1222,20 +1628,32 @@ class RobotThread(threading.Thread):
 
         return "\n".join(lines)
 
+    def _log_banner(self, *lines: str):
+        """Пишет в лог баннер фазы одним вызовом логгера.
+
+        Args:
+            *lines: Строки баннера между разделителями.
+        """
+        self.logger.info("\n%s\n%s\n%s\n", BANNER_RULE, "\n".join(lines), BANNER_RULE)
+
     def _print_statistics(self):
         """Выводит в лог статистику по типам тестов отсканированных пробирок."""
-        all_tubes = self.context.get_all_scanned_tubes()
-
-        if not all_tubes:
+        # Статистика нужна только для лога - не считаем её, если INFO отключён
+        if not self.logger.isEnabledFor(logging.INFO):
             return
 
-        stats = {}
-        for tube in all_tubes:
-            stats[tube.test_type] = stats.get(tube.test_type, 0) + 1
+        # Счётчик ведётся по мере ответов ЛИС - повторный проход
+        # по всем пробиркам не нужен
+        stats = self.context.get_test_type_counts()
 
-        self.logger.info("\n📊 Статистика по типам тестов:")
-        for test_type, count in sorted(stats.items(), key=lambda x: x[1], reverse=True):
-            self.logger.info(f"  {test_type.name}: {count} шт")
+        if not stats:
+            return
+
+        # Весь отчёт собирается в одну строку и пишется одним вызовом
+        lines = ["\n📊 Статистика по типам тестов:"]
+        for test_type, count in stats.most_common():
+            lines.append(f"  {test_type.name}: {count} шт")
+        self.logger.info("\n".join(lines))
 
     # ==================== ГЛАВНЫЙ ЦИКЛ ====================
 
@@ -1256,16 +1674,17 @@ class RobotThread(threading.Thread):
         try:
             # --- Подготовка робота ---
             self.logger.info("Подготовка робота...")
+            # Вместо фиксированных пауз ждём фактического состояния программ
             self.robot.stop_all_running_programms()
-            time.sleep(0.5)
+            self._wait_program_state("IDLE", timeout=PROGRAM_STATE_TIMEOUT)
             self.robot.reset_errors()
-            time.sleep(0.5)
+            self._wait_alarms_cleared(timeout=PROGRAM_STATE_TIMEOUT)
             self.robot.start_program(ROBOT_CFG.robot_program_name)
-            time.sleep(1.0)
+            self._wait_program_state("RUNNING", timeout=PROGRAM_STATE_TIMEOUT)
             self.logger.info("✓ Робот готов!")
 
             # --- Основной цикл ---
-            while not self.stop_event.is_set():
+            while not self._stop_is_set():
                 # Сброс контекста для нового цикла
                 self.context.reset()
 
@@ -1282,7 +1701,7 @@ class RobotThread(threading.Thread):
                 # Пробирки сразу отправляются в barcode_queue
                 total_scanned = self._scan_all_source_racks()
 
-                if self.stop_event.is_set():
+                if self._stop_is_set():
                     break
 
                 if total_scanned == 0:
@@ -1299,13 +1718,11 @@ class RobotThread(threading.Thread):
                 # Статистика
                 self._print_statistics()
 
-                if self.stop_event.is_set():
+                if self._stop_is_set():
                     break
 
                 # 4. Завершение цикла
-                self.logger.info("\n" + "=" * 60)
-                self.logger.info("✓ ЦИКЛ ЗАВЕРШЁН")
-                self.logger.info("=" * 60 + "\n")
+                self._log_banner("✓ ЦИКЛ ЗАВЕРШЁН")
 
                 self.rack_manager.clear_sorted_tubes()
 
@@ -1331,15 +1748,9 @@ class RobotThread(threading.Thread):
                         self.robot.set_number_register(NR.pause_status, NR_VAL.pause_ready)
 
                         # Ждём завершения итерации (R[1] = 2) с таймаутом
-                        timeout = 10.0
-                        start_time = time.time()
-                        while time.time() - start_time < timeout:
-                            try:
-                                if self.robot.get_number_register(NR.iteration_starter) == NR_VAL.completed:
-                                    break
-                            except Exception:
-                                pass
-                            time.sleep(0.1)
+                        self._wait_register_no_stop(
+                            NR.iteration_starter, NR_VAL.completed, timeout=10.0
+                        )
 
                         # Сбрасываем R[1] = 0
                         self.robot.set_number_register(NR.iteration_starter, NR_VAL.ready)
@@ -1348,7 +1759,7 @@ class RobotThread(threading.Thread):
                     except Exception as e:
                         self.logger.warning(f"Ошибка при завершении итерации: {e}")
 
-                elif self._stop_requested.is_set():
+                elif self._stop_requested:
                     # Робот не в режиме ожидания - отправляем в home
                     self._go_to_home()
 
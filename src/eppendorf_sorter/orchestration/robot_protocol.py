@@ -117,7 +117,7 @@ PAUSE:
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RobotNRNumbers:
     """Номера Number Registers (R[]) для взаимодействия с контроллером робота.
 
@@ -149,7 +149,7 @@ class RobotNRNumbers:
     current_col: int = 15        # R[15] - текущая колонка
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RobotNRValues:
     """Значения для Number Registers.
 
@@ -181,7 +181,7 @@ class RobotNRValues:
     pause_ready: int = 1     # Сигнал продолжения (Python -> Robot)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RobotSRNumbers:
     """Номера String Registers (SR[]) для взаимодействия с контроллером робота.
 
@@ -198,7 +198,7 @@ class RobotSRNumbers:
     scan_data: int = 3       # SR[3] - данные для сканирования "PP NN"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RobotSRValues:
     """Значения для String Registers (SR[1: ITERATION_TYPE]).
 
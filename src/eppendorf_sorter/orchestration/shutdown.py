@@ -6,25 +6,38 @@
 # src/mindray_automation_2/orchestration/shutdown.py
 import threading
 import logging
+import time
 
 
-def shutdown(stop_event: threading.Event, threads: list[threading.Thread], logger: logging.Logger):
+def shutdown(
+    stop_event: threading.Event,
+    threads: list[threading.Thread],
+    logger: logging.Logger,
+    timeout: float = 5.0,
+):
     """Корректно останавливает все рабочие потоки системы.
 
-    Устанавливает глобальное событие остановки и последовательно
-    ожидает завершения каждого потока с таймаутом.
+    Устанавливает глобальное событие остановки и ожидает завершения
+    потоков с общим таймаутом: потоки останавливаются одновременно,
+    поэтому время остановки не растёт с их числом.
 
     Args:
         stop_event: Глобальное событие, сигнализирующее потокам о необходимости
             завершения.
         threads: Список потоков, которые необходимо остановить.
         logger: Логгер для записи информации о процессе остановки.
+        timeout: Общее время ожидания всех потоков в секундах.
     """
     logger.info("Остановка системы...")
     stop_event.set()
 
+    deadline = time.monotonic() + timeout
     for th in threads:
         if th.is_alive():
-            th.join(timeout=5)
+            th.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    alive = [th.name for th in threads if th.is_alive()]
+    if alive:
+        logger.warning("Потоки не завершились за %.1f с: %s", timeout, ", ".join(alive))
 
     logger.info("Остановка завершена")
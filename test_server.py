@@ -29,6 +29,14 @@ TEST_VARIANTS = [
 TESTS_LIST = [v[0] for v in TEST_VARIANTS]
 WEIGHTS = [v[1] for v in TEST_VARIANTS]
 
+# Хвост JSON-ответа для каждого варианта тестов сериализуется один раз:
+# от запроса к запросу меняется только баркод
+RESPONSE_TAILS = [
+    (', "tests": ' + json.dumps(tests, ensure_ascii=False) + "}").encode("utf-8")
+    for tests in TESTS_LIST
+]
+VARIANT_INDICES = range(len(TEST_VARIANTS))
+
 # Настройки задержки (имитация реального сервера)
 RESPONSE_DELAY_MIN = 0.0
 RESPONSE_DELAY_MAX = 0.0
@@ -41,6 +49,15 @@ class LISHandler(BaseHTTPRequestHandler):
     и возвращает случайно выбранный набор тестов согласно настроенным весам.
     """
 
+    # HTTP/1.1: соединение клиента остаётся открытым между запросами, и
+    # поток обработчика обслуживает все запросы одного keep-alive
+    # соединения вместо нового потока на каждый запрос
+    protocol_version = "HTTP/1.1"
+
+    # Буферизованный wfile: заголовки и тело ответа уходят одним send()
+    # при flush() в конце обработки запроса, а не двумя записями в сокет
+    wbufsize = -1
+
     def do_GET(self):
         """Обрабатывает GET-запрос с JSON body вида {"tube_barcode": "..."}.
 
@@ -71,15 +88,16 @@ class LISHandler(BaseHTTPRequestHandler):
             delay = random.uniform(RESPONSE_DELAY_MIN, RESPONSE_DELAY_MAX)
             time.sleep(delay)
 
-        # Генерируем ответ
-        tests = random.choices(TESTS_LIST, weights=WEIGHTS, k=1)[0]
-
-        response = {
-            "tube_barcode": barcode,
-            "tests": tests,
-        }
+        # Генерируем ответ: {"tube_barcode": ..., "tests": [...]}
+        variant = random.choices(VARIANT_INDICES, weights=WEIGHTS, k=1)[0]
+        tests = TESTS_LIST[variant]
 
-        self._send_json(200, response)
+        body = (
+            b'{"tube_barcode": '
+            + json.dumps(barcode, ensure_ascii=False).encode("utf-8")
+            + RESPONSE_TAILS[variant]
+        )
+        self._send_body(200, body)
 
         tests_str = ", ".join(tests) if tests else "(пусто)"
         print(f"  [{barcode}] -> {tests_str}")
@@ -91,7 +109,15 @@ class LISHandler(BaseHTTPRequestHandler):
             code: HTTP-статус ответа.
             data: Данные для сериализации в JSON.
         """
-        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self._send_body(code, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    def _send_body(self, code: int, body: bytes) -> None:
+        """Отправляет HTTP-ответ с готовым JSON-телом.
+
+        Args:
+            code: HTTP-статус ответа.
+            body: Сериализованное JSON-тело в UTF-8.
+        """
         self.send_response(code)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))